@@ -0,0 +1,51 @@
+# Progressive "bucket" tax math with numpy - no python loops over brackets or incomes
+# Works the same for one income or a million: incomes go down the rows, brackets across the columns.
+    # bucket i holds up to (high - low) dollars, filled in order from the lowest bracket up
+    # amount in bucket = clip(income - dollars already in the buckets below, 0, bucket width)
+    # tax in bucket = amount * rate
+
+import numpy as np
+
+
+def bracket_widths(low, high):
+    """
+    How many dollars fit in each bracket. Missing tops count as unlimited and broken rows hold nothing
+    """
+    low = np.asarray(low, dtype=float)
+    high = np.where(np.isnan(np.asarray(high, dtype=float)), np.inf, high)
+    return np.nan_to_num(high - low, nan=0.0, posinf=np.inf)
+
+
+def progressive_tax(taxable_income, low, high, rate, gross_income=None):
+    """
+    Fills the tax brackets like buckets and returns a dict of numpy arrays:
+        amounts        - dollars that landed in each bracket   (incomes x brackets)
+        taxes          - tax owed on each bracket              (incomes x brackets)
+        total          - total tax per income
+        effective_rate - total tax / gross income in percent (0 when there is no income)
+    taxable_income can be a single number or an array. low/high/rate are either one set of brackets shared by
+    every income (shape k) or one set per income (shape n x k, pad unused brackets with width 0).
+    gross_income is what the effective rate is measured against, defaults to the taxable income.
+    A single number in gives single numbers/1d arrays out.
+    """
+    single = np.ndim(taxable_income) == 0
+    incomes = np.atleast_1d(np.asarray(taxable_income, dtype=float))
+    gross = incomes if gross_income is None else np.atleast_1d(np.asarray(gross_income, dtype=float))
+
+    widths = np.atleast_2d(bracket_widths(low, high))
+    rates = np.atleast_2d(np.nan_to_num(np.asarray(rate, dtype=float), nan=0.0))
+
+    # dollars already sitting in the buckets below each bracket (0 for the first one)
+    filled_below = np.zeros_like(widths)
+    filled_below[..., 1:] = np.cumsum(widths[..., :-1], axis=-1)
+
+    amounts = np.clip(np.maximum(incomes, 0.0)[:, None] - filled_below, 0.0, widths)
+    taxes = amounts * rates
+    total = taxes.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        effective_rate = np.where(gross > 0, total / gross * 100, 0.0)
+
+    if single:
+        return {'amounts': amounts[0], 'taxes': taxes[0], 'total': float(total[0]),
+                'effective_rate': float(effective_rate[0])}
+    return {'amounts': amounts, 'taxes': taxes, 'total': total, 'effective_rate': effective_rate}
@@ -12,9 +12,68 @@
         # - https://fred.stlouisfed.org/ - income taxes
         # https://fred.stlouisfed.org/series/IITPESP -FRED - Historical Personal Exemptions (Single)
 
+import numpy as np
 import pandas as pd
 import os
 import json
+import threading
+import time
+from types import MappingProxyType
+from AmericanRealityClasses import frame_cache
+from AmericanRealityClasses.Tax_Calculator.tax_engine import progressive_tax
+
+# filter map for the first column of each file status in the Tax Foundation sheet (rate, '>', bracket low)
+FILING_STATUS_COLUMNS = {
+    "single": 7,
+    "married_joint": 1,
+    "married_separate": 4,
+    "head_of_household": 10
+}
+# bump this when compile_bracket_table changes so old compiled tables get rebuilt
+BRACKET_CACHE_SCHEMA_VERSION = 1
+BRACKET_COLUMNS = ['Year', 'Status', 'Rate', 'Low', 'High']
+# personal exemptions started with the income tax in 1913 and were suspended by the TCJA from 2018
+PERSONAL_EXEMPTION_YEARS = (1913, 2017)
+
+# the small json tables (standard deductions, personal exemptions) are shared by the whole process
+# path -> {'mtime', 'checked', 'index'}. The file's mtime is looked at no more than once every few seconds
+JSON_RELOAD_CHECK_SECONDS = 5.0
+_json_tables = {}
+_json_tables_lock = threading.Lock()
+
+
+def load_json_table(path):
+    """
+    Loads a {"year": {"status": value}} json file into a read only dict keyed by (year, status) ex: (1970, 'single').
+    Parsed once per process and only re-read when the file's mtime changes (hot reload).
+    Missing or broken files give an empty table.
+    """
+    now = time.monotonic()
+    entry = _json_tables.get(path)
+    if entry and now - entry['checked'] < JSON_RELOAD_CHECK_SECONDS:
+        return entry['index']
+
+    with _json_tables_lock:
+        entry = _json_tables.get(path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if entry is None or entry['mtime'] != mtime:
+            index = {}
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                for year, year_entry in data.items():
+                    for key, value in year_entry.items():
+                        index[(int(year), key)] = value
+            except Exception as e:
+                print(f"Could not load {path}: {e}")
+            entry = {'mtime': mtime, 'index': MappingProxyType(index)}
+        entry['checked'] = now
+        _json_tables[path] = entry
+    return entry['index']
+
 
 class TaxDataManager:
     def __init__(self, income_bracket_file=None):
@@ -26,96 +85,233 @@ class TaxDataManager:
             self.income_bracket_file = income_bracket_file
         else:
             self.income_bracket_file = os.path.join(self.base_dir, 'resources', 'tax_foundation_tax_rates.xlsx')
+        self.standard_deduction_file = os.path.join(self.base_dir, 'resources', 'standard_deductions.json')
+        self.personal_exemption_file = os.path.join(self.base_dir, 'resources', 'personal_exemption.json')
+
+        # raw sheet is only read if the compiled table below has to be (re)built
+        self._raw_bracket_df = None
+        self.bracket_table = self.load_bracket_table()
+        self.bracket_index = self.build_bracket_index(self.bracket_table)
+        # status -> padded year x bracket arrays for the all years math (built on first use)
+        self._year_matrices = {}
+        self._rate_extremes_table = None
 
-        self.raw_bracket_df = self.load_bracket_data()
+    @property
+    def raw_bracket_df(self):
+        if self._raw_bracket_df is None:
+            self._raw_bracket_df = self.load_bracket_data()
+        return self._raw_bracket_df
 
     def load_bracket_data(self):
         if os.path.exists(self.income_bracket_file):
             return pd.read_excel(self.income_bracket_file, skiprows=1)
         return pd.DataFrame()
 
+    def load_bracket_table(self):
+        """
+        Compiled bracket table, saved next to the workbook. Only recompiled when the workbook changes
+        """
+        if not os.path.exists(self.income_bracket_file):
+            return pd.DataFrame(columns=BRACKET_COLUMNS)
+        cache_path = frame_cache.cache_path_for(self.income_bracket_file, '_brackets.feather')
+        table = frame_cache.load_or_build(self.income_bracket_file, cache_path, BRACKET_CACHE_SCHEMA_VERSION,
+                                          lambda path: self.compile_bracket_table(self.raw_bracket_df))
+        return table if not table.empty else pd.DataFrame(columns=BRACKET_COLUMNS)
+
+    @staticmethod
+    def compile_bracket_table(raw_bracket_df):
+        """
+        One time clean of the raw Tax Foundation sheet into a long typed table - one row per bracket:
+        Year | Status | Rate | Low | High
+        Rates are decimals (0.1 = 10%) and High is the next bracket's Low (inf for the top bracket).
+        """
+        if raw_bracket_df.empty:
+            return pd.DataFrame(columns=BRACKET_COLUMNS)
+
+        # years column has blank spacer rows and notes like '1940(A)' - those are not real years
+        years = pd.to_numeric(raw_bracket_df.iloc[:, 0], errors='coerce')
+        rows = raw_bracket_df[years.notna()]
+        years = years[years.notna()].astype(int)
+
+        status_tables = []
+        for status, start_col in FILING_STATUS_COLUMNS.items():
+            status_df = pd.DataFrame({'Year': years, 'Status': status,
+                                      'Rate': rows.iloc[:, start_col], 'Low': rows.iloc[:, start_col + 2]})
+            # Basic cleaning
+            for col in ['Rate', 'Low']:
+                status_df[col] = status_df[col].astype(str).str.replace('[$,%]', '', regex=True)
+                status_df[col] = pd.to_numeric(status_df[col], errors='coerce').astype(float)
+
+            by_year = status_df.groupby('Year', sort=False)
+            # some years are typed as whole percents - make every year a decimal
+            status_df['Rate'] = status_df['Rate'].where(by_year['Rate'].transform('max') <= 1, status_df['Rate'] / 100)
+            status_df['High'] = by_year['Low'].shift(-1).fillna(float('inf'))
+            status_tables.append(status_df)
+
+        return pd.concat(status_tables, ignore_index=True)[BRACKET_COLUMNS]
+
+    @staticmethod
+    def build_bracket_index(bracket_table):
+        """
+        (year, status) -> (rate, low, high) float arrays so a lookup is one dict access.
+        Arrays are read only since every caller shares them.
+        """
+        index = {}
+        if bracket_table.empty:
+            return index
+        rate = bracket_table['Rate'].to_numpy(dtype=float)
+        low = bracket_table['Low'].to_numpy(dtype=float)
+        high = bracket_table['High'].to_numpy(dtype=float)
+        for (year, status), positions in bracket_table.groupby(['Year', 'Status'], sort=False).indices.items():
+            arrays = (rate[positions], low[positions], high[positions])
+            for arr in arrays:
+                arr.flags.writeable = False
+            index[(int(year), status)] = arrays
+        return index
+
+    def get_brackets(self, year, status='single'):
+        """
+        Returns (rate, low, high) arrays for a year and filing status, empty arrays if the year is not in the data
+        """
+        if status not in FILING_STATUS_COLUMNS:
+            status = 'single'
+        empty = np.array([], dtype=float)
+        return self.bracket_index.get((int(year), status), (empty, empty, empty))
+
+    @property
+    def standard_deductions(self):
+        # Your JSON structure: data["year"]["status"] -> (year, status)
+        return load_json_table(self.standard_deduction_file)
+
+    @property
+    def personal_exemptions(self):
+        return load_json_table(self.personal_exemption_file)
+
     def get_standard_deduction(self, year, status='single'):
-        path = os.path.join(self.base_dir, 'resources', 'standard_deductions.json')
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            # Your JSON structure: data["year"]["status"]
-            return data.get(str(year), {}).get(status, 0)
-        except Exception:
+            return self.standard_deductions.get((int(year), status), 0)
+        except (TypeError, ValueError):
             return 0
 
     def get_personal_exemption(self, year, status='single', dependents=0):
-        path = os.path.join(self.base_dir, 'resources', 'personal_exemption.json')
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            year_entry = data.get(str(year), {})
+            year = int(year)
+        except (TypeError, ValueError):
+            return 0, 0, ""
+        table = self.personal_exemptions
 
-            # separate entries for visuals
-            base_amt = year_entry.get(status, 0)
-            dep_rate = year_entry.get('dependent', 0)
-            note = year_entry.get('note', '')
+        # separate entries for visuals
+        base_amt = table.get((year, status), 0)
+        dep_rate = table.get((year, 'dependent'), 0)
+        note = table.get((year, 'note'), '')
 
-            return base_amt, dep_rate, note
-        except Exception:
-            return 0, 0, ""
+        return base_amt, dep_rate, note
 
     def get_clean_income_tax_data(self, year=0, status='single'):
-        # filter map for columns for each file status
-        filing_status_map = {
-            "single": 7,
-            "married_joint": 1,
-            "married_separate": 4,
-            "head_of_household": 10
-        }
-        # Filter for the year first
-        year_df = self.raw_bracket_df[self.raw_bracket_df.iloc[:, 0] == int(year)]
-        start_col = filing_status_map.get(status, 7)
-
-        clean_df = year_df.iloc[:, [0, start_col, start_col + 2]].copy()
-        clean_df.columns = ['Year', 'Rate', 'Low']
+        """
+        Brackets for one year and filing status as a frame: Year | Rate | Low | High
+        """
+        rate, low, high = self.get_brackets(year, status)
+        return pd.DataFrame({'Year': np.full(len(rate), int(year)), 'Rate': rate, 'Low': low, 'High': high})
 
-        # Basic cleaning
-        for col in ['Rate', 'Low']:
-            clean_df[col] = clean_df[col].astype(str).str.replace('[$,%]', '', regex=True)
-            clean_df[col] = pd.to_numeric(clean_df[col], errors='coerce')
+    def load_rate_extremes_table(self):
+        """
+        Wide table of the lowest/highest marginal rate (in percent) for every year and filing status:
+        Year (index) | Lowest_Rate_single | Highest_Rate_single | Lowest_Rate_married_joint | ...
+        Saved next to the compiled bracket table and rebuilt with it when the workbook changes.
+        """
+        if self.bracket_table.empty or not os.path.exists(self.income_bracket_file):
+            return pd.DataFrame()
+        cache_path = frame_cache.cache_path_for(self.income_bracket_file, '_rate_extremes.feather')
+        return frame_cache.load_or_build(self.income_bracket_file, cache_path, BRACKET_CACHE_SCHEMA_VERSION,
+                                         lambda path: self.compile_rate_extremes(self.bracket_table))
 
-        if clean_df['Rate'].max() > 1:
-            clean_df['Rate'] = clean_df['Rate'] / 100
+    @staticmethod
+    def compile_rate_extremes(bracket_table):
+        """
+        One groupby over every year and status at once instead of cleaning the sheet once per year
+        """
+        extremes = bracket_table.groupby(['Year', 'Status'])['Rate'].agg(['min', 'max']) * 100
+        extremes = extremes.rename(columns={'min': 'Lowest_Rate', 'max': 'Highest_Rate'}).unstack('Status')
+        extremes.columns = [f"{name}_{status}" for name, status in extremes.columns]
+        return extremes
 
-        clean_df['High'] = clean_df['Low'].shift(-1).fillna(float('inf'))
-        return clean_df
+    @property
+    def rate_extremes_table(self):
+        if self._rate_extremes_table is None:
+            self._rate_extremes_table = self.load_rate_extremes_table()
+        return self._rate_extremes_table
 
     def get_annual_rate_extremes(self, status='single'):
         """
         Calculates the min and max marginal rates for every year in the dataset.
+        Year | Lowest_Rate | Highest_Rate - newest year first
         """
-        if self.raw_bracket_df.empty:
+        if status not in FILING_STATUS_COLUMNS:
+            status = 'single'
+        extremes = self.rate_extremes_table
+        if extremes.empty:
             return pd.DataFrame()
 
-        # 1. Get the first column (years)
-        raw_years = self.raw_bracket_df.iloc[:, 0]
+        result = extremes[[f"Lowest_Rate_{status}", f"Highest_Rate_{status}"]]
+        result.columns = ['Lowest_Rate', 'Highest_Rate']
+        return result.sort_index(ascending=False).rename_axis('Year').reset_index()
 
-        # 2. Convert to numeric, turning text/errors into 'NaN'
-        numeric_years = pd.to_numeric(raw_years, errors='coerce')
+    def get_year_matrices(self, status='single'):
+        """
+        Every year's brackets for one status stacked into (years x brackets) arrays.
+        Years with fewer brackets are padded with empty (0 wide, 0%) brackets so they fill nothing.
+        Deductions/exemptions per year are lined up with the same rows. Cached per status and rebuilt
+        if the json tables were hot reloaded.
+        """
+        if status not in FILING_STATUS_COLUMNS:
+            status = 'single'
+        deductions, exemptions = self.standard_deductions, self.personal_exemptions
+        cached = self._year_matrices.get(status)
+        if cached and cached['tables'][0] is deductions and cached['tables'][1] is exemptions:
+            return cached
 
-        # 3. Drop NaNs, get unique values, and sort
-        years = sorted(numeric_years.dropna().unique(), reverse=True)
+        years = np.array(sorted(year for year, year_status in self.bracket_index if year_status == status), dtype=int)
+        max_brackets = max((len(self.bracket_index[(year, status)][0]) for year in years), default=0)
+        rate = np.zeros((len(years), max_brackets))
+        low = np.zeros((len(years), max_brackets))
+        high = np.zeros((len(years), max_brackets))
+        for row, year in enumerate(years):
+            year_rate, year_low, year_high = self.bracket_index[(year, status)]
+            rate[row, :len(year_rate)] = year_rate
+            low[row, :len(year_low)] = year_low
+            high[row, :len(year_high)] = year_high
 
-        results = []
-        for year in years:
-            try:
-                # Ensure year is passed as an int
-                df_year = self.get_clean_income_tax_data(year=int(year), status=status)
-
-                if not df_year.empty:
-                    results.append({
-                        'Year': int(year),
-                        'Lowest_Rate': df_year['Rate'].min() * 100,
-                        'Highest_Rate': df_year['Rate'].max() * 100
-                    })
-            except Exception:
-                continue
-
-        return pd.DataFrame(results)
+        exemption_years = (years >= PERSONAL_EXEMPTION_YEARS[0]) & (years <= PERSONAL_EXEMPTION_YEARS[1])
+        cached = {
+            'years': years, 'rate': rate, 'low': low, 'high': high,
+            'standard_deduction': np.array([deductions.get((year, status), 0) for year in years], dtype=float),
+            'personal_exemption': np.where(exemption_years, [exemptions.get((year, status), 0) for year in years], 0.0),
+            'dependent_exemption': np.where(exemption_years, [exemptions.get((year, 'dependent'), 0) for year in years], 0.0),
+            'tables': (deductions, exemptions),
+        }
+        self._year_matrices[status] = cached
+        return cached
+
+    def get_tax_across_years(self, gross_income, status='single', dependents=0):
+        """
+        What the same income would owe in every year of the data (1862 - now) - one pass over all the years:
+        Year | Standard_Deduction | Exemptions | Taxable_Income | Total_Tax | Effective_Rate | Take_Home
+        Same shield rules as the calculator page - standard deduction + personal/dependent exemptions (1913-2017).
+        """
+        matrices = self.get_year_matrices(status)
+        exemptions = matrices['personal_exemption'] + matrices['dependent_exemption'] * dependents
+        taxable_income = np.maximum(0.0, gross_income - (matrices['standard_deduction'] + exemptions))
+
+        bucket_math = progressive_tax(taxable_income, matrices['low'], matrices['high'], matrices['rate'],
+                                      gross_income=np.full(len(taxable_income), float(gross_income)))
+        return pd.DataFrame({
+            'Year': matrices['years'],
+            'Standard_Deduction': matrices['standard_deduction'],
+            'Exemptions': exemptions,
+            'Taxable_Income': taxable_income,
+            'Total_Tax': bucket_math['total'],
+            'Effective_Rate': bucket_math['effective_rate'],
+            'Take_Home': gross_income - bucket_math['total']
+        })
 
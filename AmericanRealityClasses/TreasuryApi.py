@@ -16,148 +16,497 @@
 import requests
 import json
 import os
+import time
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from AmericanRealityClasses import frame_cache
+
+# bump this when the cleaned debt frame changes shape so old feather caches get rebuilt
+DEBT_CACHE_SCHEMA_VERSION = 1
+TAX_POLICY_CACHE_SCHEMA_VERSION = 1
+TAX_POLICY_URL = r'https://taxpolicycenter.org/sites/default/files/statistics/spreadsheet/fed_receipt_funds_3.xlsx'
+# the workbook changes about once a year - ask the Tax Policy Center at most once a day if it did
+TAX_POLICY_RECHECK_SECONDS = 24 * 60 * 60
+
+# Fiscal Data api - https://fiscaldata.treasury.gov/api-documentation/
+FISCAL_DATA_BASE_URL = r'https://api.fiscaldata.treasury.gov/services/api/fiscal_service'
+FISCAL_DATA_MAX_PAGE_SIZE = 10000
+DEBT_OUTSTANDING_DATASET = 'v2/accounting/od/debt_outstanding'
+# Monthly Treasury Statement table 9 - receipts by source and outlays by budget function
+MTS_TABLE_9_DATASET = 'v1/accounting/mts/mts_table_9'
+# the api sends every value as a string ('null' for blanks) - column -> type for the datasets we use.
+# Columns not listed stay strings. 'datetime' parses dates, int columns with blanks become nullable Int64
+DATASET_DTYPES = {
+    DEBT_OUTSTANDING_DATASET: {
+        'record_fiscal_year': 'int64',
+        'debt_outstanding_amt': 'float64'
+    },
+    MTS_TABLE_9_DATASET: {
+        'record_fiscal_year': 'int64',
+        'record_calendar_month': 'int64',
+        'current_month_rcpt_outly_amt': 'float64',
+        'current_fytd_rcpt_outly_amt': 'float64'
+    }
+}
+# datasets without a map above get typed from the api's own meta dataTypes
+API_DATA_TYPES = {
+    'CURRENCY': 'float64',
+    'NUMBER': 'float64',
+    'PERCENTAGE': 'float64',
+    'INTEGER': 'Int64',
+    'YEAR': 'Int64',
+    'QUARTER': 'Int64',
+    'MONTH': 'Int64',
+    'DAY': 'Int64',
+    'DATE': 'datetime'
+}
 
 
 class Treasury:
 
-    def __init__(self):
+    def __init__(self, max_workers=8, retries=3, backoff=0.5, timeout=5):
         # self.base_path = r'https://api.fiscaldata.treasury.gov/services/api/fiscal_service'
         self.ErrorLog = []
+        # page fetch settings - workers are the most pages we ask the API for at one time
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        # seconds to wait on one api request before it counts as a failed try
+        self.timeout = timeout
+        self.session = None
+        # 1. Define the "Identity" (Headers) Try to tell the API as if I am a browser so it runs faster
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+        }
+
+    def getSession(self):
+        """
+        One pooled session per instance so every page request reuses the same TCP/TLS connections
+        """
+        if self.session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(self.headers)
+            self.session = session
+        return self.session
+
+    def getJson(self, url, label):
+        """
+        GET on the pooled session, returns the json. Retries timeouts (self.timeout), 429s and 5xx errors with
+        backoff (0.5s, 1s, 2s ...) and raises ConnectionError once the retries run out. label goes in the error
+        ex: 'page 3'. Api pages come through FiscalDataClient (getAllDebtPages for the debt dataset)
+        """
+        session = self.getSession()
+        error = None
+        for attempt in range(self.retries + 1):
+            try:
+                response = session.get(url, timeout=self.timeout)
+                if response.status_code == 200:
+                    return response.json()
+                error = f"API ERROR: {response.status_code} on {label}"
+                # client errors will not fix themselves - no point in asking again
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+            except requests.RequestException as e:
+                error = f"API ERROR: {e} on {label}"
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        self.ErrorLog.append(error)
+        raise ConnectionError(error)
+
+    def getAllDebtPages(self, base_url, page_size=100, concurrent=True, filters=None):
+        """
+        Reads meta total-pages from page 1 then grabs the rest of the pages, at the same time if concurrent is True.
+        Pages are put back together in page order no matter which one finishes first.
+        Returns the raw (all string) rows - that is what the json backup stores
+        """
+        client = FiscalDataClient(self, page_size=page_size)
+        data = []
+        for page in client.iterPages(base_url, filters=filters, concurrent=concurrent):
+            data.extend(page['data'])
+        return data
+
+    @staticmethod
+    def loadDebtBackup(storage_path):
+        """
+        Returns the list of records saved in the debt backup json, empty list if there is no usable file
+        """
+        if os.path.exists(storage_path) and os.path.getsize(storage_path):
+            with open(storage_path, 'r') as f:
+                return json.load(f).get('data', [])
+        return []
+
+    @staticmethod
+    def saveDebtBackup(storage_path, data):
+        """
+        The json backup is the import/export copy - the feather cache gets rebuilt from it on the next load
+        """
+        with open(storage_path, 'w') as f:
+            json.dump({"data": data}, f)
+
+    @staticmethod
+    def cleanDebtData(data):
+        """
+        Api rows are all strings - turn them into a typed frame
+        """
+        return FiscalDataClient.castRecords(data, DATASET_DTYPES[DEBT_OUTSTANDING_DATASET])
+
+    def loadDebtFrame(self, storage_path):
+        """
+        Loads the cleaned debt frame from the feather cache next to the backup json. The cache is only trusted if its
+        schema version and the json's hash match, otherwise the json is parsed, cleaned and the cache rebuilt.
+        """
+        if not (os.path.exists(storage_path) and os.path.getsize(storage_path)):
+            return pd.DataFrame()
+        cache_path = frame_cache.cache_path_for(storage_path, '.feather')
+        metadata = {'schema_version': DEBT_CACHE_SCHEMA_VERSION, 'source_hash': frame_cache.file_hash(storage_path)}
+
+        debt_df = frame_cache.read_frame_cache(cache_path, metadata)
+        if debt_df is None:
+            debt_df = self.cleanDebtData(self.loadDebtBackup(storage_path))
+            if not debt_df.empty:
+                frame_cache.write_frame_cache(debt_df, cache_path, metadata)
+        return debt_df
+
+    @staticmethod
+    def mergeDebtRecords(old_data, new_data):
+        """
+        Merges new api rows into the stored rows. record_date is the key so a re-sent row replaces the old one
+        instead of showing up twice. Returned sorted by record_date (oldest first) like the api sends it.
+        """
+        merged = {row['record_date']: row for row in old_data}
+        merged.update({row['record_date']: row for row in new_data})
+        return [merged[record_date] for record_date in sorted(merged)]
+
+    def syncDebtBackup(self, base_url, storage_path, concurrent=True):
+        """
+        Incremental refresh - only asks the api for rows newer than the last record_date we already have,
+        then merges them into the backup. Falls back to the full crawl when there is no backup yet.
+        The backup's modified time is 'last checked against the api' - it moves on every successful sync,
+        even when there was nothing new (the dataset only gets about one new row a year).
+        Returns the cleaned debt frame.
+        """
+        debt_df = self.loadDebtFrame(storage_path)
+        if debt_df.empty:
+            data = self.getAllDebtPages(base_url, concurrent=concurrent)
+        else:
+            last_date = debt_df['record_date'].max()
+            new_rows = self.getAllDebtPages(base_url, concurrent=concurrent, filters=f"record_date:gt:{last_date}")
+            # nothing new - the cached frame is already up to date, just mark the backup as checked
+            if not new_rows:
+                os.utime(storage_path)
+                return debt_df
+            data = self.mergeDebtRecords(self.loadDebtBackup(storage_path), new_rows)
+        if data:
+            self.saveDebtBackup(storage_path, data)
+        return self.loadDebtFrame(storage_path)
 
     def getHistoricalDebtAPIData(self,
-                                 base_url=r'https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v2/accounting/od/debt_outstanding'):
+                                 base_url=r'https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v2/accounting/od/debt_outstanding',
+                                 concurrent=True, incremental=False, storage_path=None):
         """
         Gets api data and all pages into a list of dicts. can be put into a pandas data frame if needed
-        Built of this api. # TODO need to try other base urls to see if it is dynamic
+        Built of this api - other datasets go through FiscalDataClient (same session, paging and typing)
         base_url = r'https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v2/accounting/od/debt_outstanding'
+        concurrent = True pulls pages 2+ at the same time, False walks them one at a time
+        incremental = True only pulls rows newer than the backup's last record_date and merges them in
+        storage_path = where the backup json lives, defaults to resources/debt_backup.json
         """
-        data = []
         data_flag = 'API'
         debt_df = pd.DataFrame()
-        page_number = 1
         # setup file paths
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        storage_path = os.path.join(current_dir,'resources','debt_backup.json')
+        if storage_path is None:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            storage_path = os.path.join(current_dir,'resources','debt_backup.json')
         # confirm path exists
         os.makedirs(os.path.dirname(storage_path), exist_ok=True)
-        # 1. Define the "Identity" (Headers) Try to tell the API as if I am a browser so it runs faster
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-        }
+        # always ask the api - the backup is only for when it is down. (There used to be a 350 day gate on the
+        # backup's age here, but it was backwards: a backup OLDER than 350 days skipped the api for good.)
         try:
-            # try to use stored file
-            if os.path.exists(storage_path) and os.path.getsize(storage_path):
-                file_time = os.path.getmtime(storage_path)
-                last_updated = datetime.fromtimestamp(file_time)
-                # use csv files until end of year
-                if datetime.now() - last_updated > timedelta(days=350):
-                    with open(storage_path,'r') as f:
-                        json_data = json.load(f)
-                    debt_df = pd.DataFrame(json_data['data'])
-                    data_flag = 'Back Up'
-
-            # gets API if JSON fails or is old
-            if debt_df.empty:
-                # get API if CSV is old or empty
-                while True:
-                    # try to call data with GET
-                    response = requests.get(f"{base_url}?page[number]={page_number}&page[size]=100", headers=headers,timeout=5)
-                    if response.status_code == 200:
-                        # get out data to phrase
-                        json_data = response.json()
-
-                        # append the data from the current page to the list
-                        data.extend(json_data['data'])
-
-                        # get links next key for more pages
-                        next_page = json_data['links'].get('next')
-                        # increase page number if needed
-                        if next_page:
-                            page_number +=1
-                        else:
-                            break
-                    else:
-                        print(f"API ERROR: {response.status_code}")
-                        break
-                if data:
-                    debt_df = pd.DataFrame(data)
-                    with open(storage_path,'w') as f:
-                        json.dump({"data":data},f)
+            try:
+                if incremental:
+                    # only new rows - one small request on a routine refresh
+                    debt_df = self.syncDebtBackup(base_url, storage_path, concurrent=concurrent)
+                else:
+                    # the whole dataset
+                    data = self.getAllDebtPages(base_url, concurrent=concurrent)
+                    if data:
+                        self.saveDebtBackup(storage_path, data)
+                        debt_df = self.loadDebtFrame(storage_path)
+            except ConnectionError as e:
+                # api is down but we still have what was synced last time
+                print(f"API Connection Error: {e}. Using back up...")
+                debt_df = self.loadDebtFrame(storage_path)
+                data_flag = 'Back Up'
 
         except Exception as e:
             print(f"API Connection Error: {e}")
 
 
         if not debt_df.empty:
-            # Slight cleaning of df
-            debt_df['record_fiscal_year'] = debt_df['record_fiscal_year'].astype(int)
-            debt_df['debt_outstanding_amt'] = debt_df['debt_outstanding_amt'].astype(float)
+            # frames from loadDebtFrame are already cleaned and typed
             return debt_df, data_flag
         else:
             return pd.DataFrame(), data_flag
 
     def getTaxPolicyDownload(self,
-                             tax_policy_save_location: str = r'resources/TaxPolicyCenterHistoricRevenues.xlsx'):
+                             tax_policy_save_location: str = r'resources/TaxPolicyCenterHistoricRevenues.xlsx',
+                             tax_policy_url=TAX_POLICY_URL):
         df = pd.DataFrame()  # Initialize here so it's always in scope
 
         directory = os.path.dirname(tax_policy_save_location)
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        # 1. Logic Gate: Only download if file is missing or older than 350 days
+        # 1. Logic Gate: Only download if file is missing or was last checked more than a day ago.
+        # The check time lives in the .http.json next to the workbook - a 304 leaves the file (and its mtime) alone
         should_download = True
         if os.path.exists(tax_policy_save_location):
-            file_age = datetime.fromtimestamp(os.path.getmtime(tax_policy_save_location))
-            if datetime.now() - file_age > timedelta(days=350):
+            validators = self.loadValidators(frame_cache.cache_path_for(tax_policy_save_location, '.http.json'))
+            last_checked = validators.get('last_checked')
+            if last_checked is not None and time.time() - last_checked < TAX_POLICY_RECHECK_SECONDS:
                 should_download = False
-                print(f"✅ Using local Tax Policy file (Updated: {file_age.date()})")
+                print(f"✅ Using local Tax Policy file (Checked: {datetime.fromtimestamp(last_checked):%Y-%m-%d %H:%M})")
 
         if should_download:
-            base_url = r'https://taxpolicycenter.org/sites/default/files/statistics/spreadsheet/fed_receipt_funds_3.xlsx'
-            try:
-                response = requests.get(base_url, timeout=10)
-                if response.status_code == 200:
-                    with open(tax_policy_save_location, 'wb') as f:
-                        f.write(response.content)
-                        print(f"Tax Policy File was successfully saved at {tax_policy_save_location}")
-                else:
-                    print(f"Download failed (Status: {response.status_code}). Using old file...")
-            except Exception as e:
-                print(f"Connection error during download: {e}. Trying to use old file...")
+            # conditional GET - an unchanged workbook is a quick 304 instead of the whole file
+            status = self.downloadIfChanged(tax_policy_url, tax_policy_save_location)
+            if status == 'downloaded':
+                print(f"Tax Policy File was successfully saved at {tax_policy_save_location}")
 
         # 2. Process Data (This will now run even if the download above failed)
         if os.path.exists(tax_policy_save_location):
-            try:
-                df = pd.read_excel(tax_policy_save_location, skiprows=6)
-                df = df.drop(0)
-
-                df.rename(columns={
-                    "Unnamed: 0": "Fiscal Year",
-                    "Total": "Receipts Total",
-                    "Total.1": "Outlays Total",
-                    "Total.2": "Surplus or Deficit(-) Total"
-                }, inplace=True)
-
-                # Filter out estimates and clean types
-                estimate_index = df[df['Fiscal Year'].str.contains('Estimates', case=False, na=False)].index[0]
-                df = df.iloc[:estimate_index - 2]
-                df = df[df['Fiscal Year'] != 'TQ']
-
-                df['Fiscal Year'] = df['Fiscal Year'].astype(int)
-                df['Surplus or Deficit(-) Total'] = df['Surplus or Deficit(-) Total'] * 1_000_000
-            except Exception as e:
-                print(f"Error processing the Excel file: {e}")
-                df = pd.DataFrame()
+            df = self.loadTaxPolicyFrame(tax_policy_save_location)
         else:
             print("No local file found and download failed. Returning empty DataFrame.")
 
         return df
 
+    @staticmethod
+    def loadValidators(validators_path):
+        """
+        ETag / Last-Modified saved from the last download and last_checked (epoch seconds of the last 200 or 304)
+        - {} if there is none
+        """
+        try:
+            with open(validators_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def saveValidators(validators_path, validators):
+        with open(validators_path, 'w') as f:
+            json.dump(validators, f)
+
+    def downloadIfChanged(self, url, save_location, timeout=10, chunk_size=1 << 16):
+        """
+        Downloads url to save_location only if it changed since the last download.
+        Sends If-None-Match / If-Modified-Since from the ETag / Last-Modified saved next to the file
+        (ex: fed.xlsx -> fed.http.json) on the pooled session. A 200 is streamed into a temp file and renamed
+        over the old one, so a failed download never leaves half a file behind.
+        A 200 or 304 also saves last_checked in the .http.json, a failure does not.
+        Returns 'downloaded', 'not modified' or 'failed'
+        """
+        validators_path = frame_cache.cache_path_for(save_location, '.http.json')
+        headers = {}
+        validators = {}
+        # only ask 'did it change' if we still have the file it would be compared to
+        if os.path.exists(save_location):
+            validators = self.loadValidators(validators_path)
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        tmp_path = save_location + '.tmp'
+        try:
+            with self.getSession().get(url, headers=headers, timeout=timeout, stream=True) as response:
+                if response.status_code == 304:
+                    # still current - only the check time moves
+                    validators['last_checked'] = time.time()
+                    self.saveValidators(validators_path, validators)
+                    return 'not modified'
+                if response.status_code != 200:
+                    print(f"Download failed (Status: {response.status_code}). Using old file...")
+                    return 'failed'
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                os.replace(tmp_path, save_location)
+                self.saveValidators(validators_path, {'etag': response.headers.get('ETag'),
+                                                      'last_modified': response.headers.get('Last-Modified'),
+                                                      'last_checked': time.time()})
+                return 'downloaded'
+        except (requests.RequestException, OSError) as e:
+            print(f"Connection error during download: {e}. Trying to use old file...")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return 'failed'
+
+    def loadTaxPolicyFrame(self, tax_policy_save_location):
+        """
+        Cleaned receipts/outlays/deficit frame from the feather cache next to the workbook.
+        The slow openpyxl parse only runs when the workbook really changed (see frame_cache.load_or_build)
+        """
+        cache_path = frame_cache.cache_path_for(tax_policy_save_location, '.feather')
+        return frame_cache.load_or_build(tax_policy_save_location, cache_path, TAX_POLICY_CACHE_SCHEMA_VERSION,
+                                         self.parseTaxPolicyWorkbook)
+
+    @staticmethod
+    def parseTaxPolicyWorkbook(tax_policy_save_location):
+        """
+        Reads the Tax Policy Center workbook and cleans it. This is the slow part (openpyxl) so it only runs on a cache miss
+        """
+        try:
+            df = pd.read_excel(tax_policy_save_location, skiprows=6)
+            df = df.drop(0)
+
+            df.rename(columns={
+                "Unnamed: 0": "Fiscal Year",
+                "Total": "Receipts Total",
+                "Total.1": "Outlays Total",
+                "Total.2": "Surplus or Deficit(-) Total"
+            }, inplace=True)
+
+            # Filter out estimates and clean types
+            estimate_index = df[df['Fiscal Year'].str.contains('Estimates', case=False, na=False)].index[0]
+            df = df.iloc[:estimate_index - 2]
+            df = df[df['Fiscal Year'] != 'TQ']
+
+            df['Fiscal Year'] = df['Fiscal Year'].astype(int)
+            df['Surplus or Deficit(-) Total'] = df['Surplus or Deficit(-) Total'] * 1_000_000
+        except Exception as e:
+            print(f"Error processing the Excel file: {e}")
+            df = pd.DataFrame()
+        return df
+
+
+class FiscalDataClient:
+    """
+    Generic reader for any Fiscal Data api dataset ex: 'v2/accounting/od/debt_outstanding' or
+    'v1/accounting/mts/mts_table_9'. Pages stream out in order one at a time so a big dataset never has to sit in
+    memory as one giant list, and every page can come back as an already typed DataFrame batch.
+    Uses the Treasury instance's pooled session and retry policy.
+        fields   - only these columns (the api does the projection so less comes over the wire)
+        filters  - api filter strings ex: 'record_fiscal_year:gte:2000' or a list of them (all must match)
+        sort     - ex: '-record_date'
+        page_size - rows per request, up to FISCAL_DATA_MAX_PAGE_SIZE
+    """
+
+    def __init__(self, treasury=None, page_size=FISCAL_DATA_MAX_PAGE_SIZE, dtypes=None):
+        self.treasury = treasury if treasury is not None else Treasury()
+        self.page_size = min(int(page_size), FISCAL_DATA_MAX_PAGE_SIZE)
+        # dataset -> {column: type}, callers can add their own or override ours
+        self.dtypes = {**DATASET_DTYPES, **(dtypes or {})}
+
+    @staticmethod
+    def datasetUrl(dataset):
+        """
+        Full endpoint url - dataset can be the path after /fiscal_service/ or already a full url
+        """
+        if dataset.startswith('http'):
+            return dataset
+        return f"{FISCAL_DATA_BASE_URL}/{dataset.strip('/')}"
+
+    @staticmethod
+    def datasetName(dataset):
+        """
+        The DATASET_DTYPES key for a dataset path or full url
+        """
+        return dataset.split('/fiscal_service/')[-1].strip('/')
+
+    def pageUrl(self, dataset, page_number, page_size=None, fields=None, filters=None, sort=None):
+        url = f"{self.datasetUrl(dataset)}?page[number]={page_number}&page[size]={page_size or self.page_size}"
+        if fields:
+            url += f"&fields={','.join(fields)}"
+        if filters:
+            url += f"&filter={filters if isinstance(filters, str) else ','.join(filters)}"
+        if sort:
+            url += f"&sort={sort}"
+        return url
+
+    def getPage(self, dataset, page_number, page_size=None, fields=None, filters=None, sort=None):
+        return self.treasury.getJson(self.pageUrl(dataset, page_number, page_size, fields, filters, sort),
+                                     f"page {page_number}")
+
+    def iterPages(self, dataset, fields=None, filters=None, sort=None, page_size=None, concurrent=True):
+        """
+        Yields the raw json of every page in page order. Page 1 says how many pages there are, then (if concurrent)
+        up to max_workers pages are in flight at a time while the earlier ones are handed out
+        """
+        def get(page_number):
+            return self.getPage(dataset, page_number, page_size, fields, filters, sort)
+
+        first_page = get(1)
+        yield first_page
+        total_pages = int(first_page.get('meta', {}).get('total-pages', 1))
+        remaining_pages = range(2, total_pages + 1)
+
+        if concurrent and len(remaining_pages) > 1:
+            window = min(self.treasury.max_workers, len(remaining_pages))
+            with ThreadPoolExecutor(max_workers=window) as pool:
+                in_flight = [pool.submit(get, page_number) for page_number in remaining_pages[:window]]
+                next_pages = iter(remaining_pages[window:])
+                while in_flight:
+                    page = in_flight.pop(0).result()
+                    # keep the window full - one finished page in, one new request out
+                    page_number = next(next_pages, None)
+                    if page_number is not None:
+                        in_flight.append(pool.submit(get, page_number))
+                    yield page
+        else:
+            for page_number in remaining_pages:
+                yield get(page_number)
+
+    def iterBatches(self, dataset, fields=None, filters=None, sort=None, page_size=None, concurrent=True):
+        """
+        Same as iterPages but every page comes out as a typed DataFrame
+        """
+        dtypes = self.dtypes.get(self.datasetName(dataset))
+        for page in self.iterPages(dataset, fields, filters, sort, page_size, concurrent):
+            page_dtypes = dtypes
+            if page_dtypes is None:
+                # no map of our own - use the types the api reports for each column
+                api_types = page.get('meta', {}).get('dataTypes', {})
+                page_dtypes = {column: API_DATA_TYPES[api_type] for column, api_type in api_types.items()
+                               if api_type in API_DATA_TYPES}
+            yield self.castRecords(page.get('data', []), page_dtypes)
+
+    def getFrame(self, dataset, fields=None, filters=None, sort=None, page_size=None, concurrent=True):
+        """
+        Every batch in one frame
+        """
+        batches = [batch for batch in self.iterBatches(dataset, fields, filters, sort, page_size, concurrent)
+                   if not batch.empty]
+        return pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=fields)
+
+    @staticmethod
+    def castRecords(records, dtypes):
+        """
+        Api rows (all strings) -> DataFrame with the columns in dtypes cast, the rest stay strings
+        """
+        df = pd.DataFrame(records)
+        if df.empty:
+            return df
+        for column, dtype in dtypes.items():
+            if column not in df.columns:
+                continue
+            if dtype == 'datetime':
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+                continue
+            # 'null' and anything else that is not a number becomes NaN
+            values = pd.to_numeric(df[column], errors='coerce')
+            if dtype == 'int64' and values.isna().any():
+                dtype = 'Int64'
+            df[column] = values.astype(dtype)
+        return df
 
 
-        
 if __name__ == '__main__':
     # instance
     test = Treasury()
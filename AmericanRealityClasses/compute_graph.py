@@ -0,0 +1,69 @@
+# Lazy, memoized computations for a Streamlit page
+# The page registers named nodes (a function + the names of the inputs / other nodes it needs) and then asks only for
+# the nodes the visible tab or view actually shows. A node runs when it is asked for AND something it depends on
+# changed since it last ran - otherwise the result kept in session state from an earlier rerun is handed back.
+# So flipping viewType (or picking a new president) only reruns the nodes downstream of that choice, and nodes
+# for a hidden tab never run at all.
+
+class ComputeGraph:
+    """
+    memo is any dict-like that survives reruns (ex: a dict in st.session_state):
+        node name -> (stamp of its dependencies, version, value)
+    Inputs are compared by value (==) so they should be small: strings, numbers, tuples, the current snapshot...
+    Nodes are compared by version - a counter bumped every time the node reruns.
+    """
+
+    def __init__(self, memo):
+        self._memo = memo
+        self._inputs = {}
+        self._nodes = {}
+        # nodes already checked (and rerun if needed) during this rerun
+        self._fresh = set()
+        # nodes that actually ran this rerun, in order
+        self.computed = []
+
+    def input(self, name, value):
+        """
+        Sets an outside value (widget selection, data snapshot...) nodes can depend on
+        """
+        self._inputs[name] = value
+
+    def node(self, name, *deps):
+        """
+        Decorator that registers func as node `name`, called with the values of deps in order:
+            @graph.node('term', 'data', 'president')
+            def term(data, president): ...
+        """
+        def register(func):
+            self._nodes[name] = (func, deps)
+            return func
+        return register
+
+    def _stamp(self, name):
+        # what a dependent node remembers about `name` to know if it has to rerun
+        if name in self._inputs:
+            return ('input', self._inputs[name])
+        self.get(name)
+        return ('node', self._memo[name][1])
+
+    def get(self, name):
+        """
+        Value of an input or node - the node (and anything upstream of it that changed) only runs if it is stale
+        """
+        if name in self._inputs:
+            return self._inputs[name]
+        if name not in self._nodes:
+            raise KeyError(f"No input or node named '{name}' - set the input before asking for nodes that need it")
+        if name in self._fresh:
+            return self._memo[name][2]
+
+        func, deps = self._nodes[name]
+        stamp = tuple(self._stamp(dep) for dep in deps)
+        entry = self._memo.get(name)
+        if entry is None or entry[0] != stamp:
+            value = func(*(self.get(dep) for dep in deps))
+            entry = (stamp, entry[1] + 1 if entry is not None else 0, value)
+            self._memo[name] = entry
+            self.computed.append(name)
+        self._fresh.add(name)
+        return entry[2]
@@ -0,0 +1,196 @@
+# Plotly figures for the dashboard
+# Layouts and trace styles are set up ONE time here. A figure is built the first time a (view, president / range)
+# is looked at, then the same figure object is handed back on every rerun after that - changing an unrelated widget
+# no longer rebuilds (and re-validates) every trace.
+# Each snapshot of the data gets its own FigureCache, so a background data refresh starts from an empty cache.
+# Trace data goes out as typed numeric arrays (plotly sends numpy arrays as compact base64) - no object/string
+# columns, and the debt line sends x0/dx instead of a year array. That is where the payload savings come from,
+# nothing is downsampled: the whole 1790-today history is only ~240 points.
+# The surplus/deficit label lives in the bar trace's hovertemplate (one trace per label), not a string per bar.
+
+# imports
+import threading
+from collections import OrderedDict
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+FIGURE_CACHE_SIZE = 256
+# is it a surplus year (deficit column > 0)? -> label shown in the bar hover
+FISCAL_STATUS_LABELS = {False: 'Deficit', True: 'Surplus'}
+
+# --- base layouts (built once) ---
+PRESIDENT_LAYOUT = go.Layout(
+    template='plotly_dark',
+    hovermode='x unified',
+    height=600,
+    showlegend=True,  # Make sure users can see which line is which
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    margin=dict(l=10, r=10, t=20, b=10),
+    yaxis2=dict(overlaying='y', side='right', showgrid=False),
+    # THE BIGGER BOX SETTINGS:
+    hoverlabel=dict(
+        bgcolor="#1e1e1e",
+        font_size=24,
+        bordercolor="#FFD700",
+        namelength=-1
+    )
+)
+
+YEAR_LAYOUT = go.Layout(
+    template='plotly_dark',
+    hovermode='x unified',
+    height=600,
+    margin=dict(l=10, r=10, t=20, b=10),
+    yaxis2=dict(overlaying='y', side='right'),
+    hoverlabel=dict(
+        bgcolor="#1e1e1e",
+        font_size=24,
+        font_family="Arial Black",
+        bordercolor="#FFD700"
+    )
+)
+
+PIE_LAYOUT = dict(
+    template="plotly_dark",
+    height=450,
+    legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+)
+
+# --- trace styles ---
+VIEW_STYLES = {
+    'President': {'layout': PRESIDENT_LAYOUT, 'title_size': 22, 'bar_opacity': 0.4},
+    'Year': {'layout': YEAR_LAYOUT, 'title_size': 26, 'bar_opacity': 0.6}
+}
+
+
+def debt_hovertemplate(title_size):
+    # customdata = Low Tax, High Tax (the Surplus/Deficit line comes from the bar trace in the same hover box)
+    return (
+            f"<span style='font-size:{title_size}px;'><b>📅 %{{x}}</b></span><br><br>" +
+            "<span style='font-size:20px;'>💰 <b>Debt:</b> %{y}</span><br>" +
+            "<span style='font-size:20px;'>📉 <b>Min Tax:</b> %{customdata[0]:.1f}%</span><br>" +
+            "<span style='font-size:20px;'>📈 <b>Max Tax:</b> %{customdata[1]:.1f}%</span>" +
+            "<extra></extra>"
+    )
+
+
+def chart_columns(combined_data):
+    """
+    The numbers a debt chart needs as typed numpy arrays: year (int16), debt, deficit (float64), tax rates (float32)
+    """
+    return {
+        'years': combined_data['Year'].to_numpy(dtype=np.int16),
+        'debt': combined_data['Debt'].to_numpy(dtype=np.float64),
+        'deficit': combined_data['Deficit'].to_numpy(dtype=np.float64),
+        'taxes': np.column_stack([combined_data['Low_Tax'].to_numpy(dtype=np.float32),
+                                  combined_data['High_Tax'].to_numpy(dtype=np.float32)])
+    }
+
+
+def year_axis(years):
+    """
+    x0/dx when the years run one after another (nothing to send), otherwise the years themselves
+    """
+    if len(years) > 1 and np.all(np.diff(years) == 1):
+        return {'x0': int(years[0]), 'dx': 1}
+    return {'x': years}
+
+
+def build_debt_figure(view, combined_data, inherited_path=None):
+    """
+    Gold debt line + blue deficit bars (+ the silver 'Inherited Path' when inherited_path = ((x0, x1), (y0, y1)))
+    for a Year | Debt | Deficit | Low_Tax | High_Tax frame
+    """
+    style = VIEW_STYLES[view]
+    columns = chart_columns(combined_data)
+    traces = [
+        # 1. THE ACTUAL DEBT (Gold)
+        go.Scatter(
+            **year_axis(columns['years']),
+            y=columns['debt'],
+            name='Actual Debt',
+            line=dict(color='#FFD700', width=4),
+            yaxis='y1',
+            customdata=columns['taxes'],
+            hovertemplate=debt_hovertemplate(style['title_size'])
+        )
+    ]
+    if inherited_path is not None:
+        # 2. THE INHERITED PATH (Silver Dashed)
+        traces.append(go.Scatter(
+            x=inherited_path[0],
+            y=inherited_path[1],
+            name='Inherited Path',
+            line=dict(color='#C0C0C0', width=2, dash='dot'),
+            yaxis='y1'
+        ))
+    # 3. THE DEFICIT BARS (Blue) - one trace per surplus/deficit label so the label lives in the trace's
+    # hovertemplate instead of a string per bar. Same offsetgroup = same bar slot, same legendgroup = one legend entry.
+    has_data = ~np.isnan(columns['deficit'])
+    surplus = columns['deficit'] > 0
+    for is_surplus, label in FISCAL_STATUS_LABELS.items():
+        points = has_data & (surplus == is_surplus)
+        traces.append(go.Bar(
+            x=columns['years'][points],
+            y=columns['deficit'][points],
+            name='Annual Fiscal Status',
+            legendgroup='fiscal_status',
+            offsetgroup='fiscal_status',
+            showlegend=not is_surplus,
+            hovertemplate=f"<b>{label}:</b> %{{y}}<extra></extra>",
+            marker=dict(color='#2E86C1'),
+            opacity=style['bar_opacity'],
+            yaxis='y2'
+        ))
+    return go.Figure(data=traces, layout=style['layout'])
+
+
+def build_spending_pie(spending_breakdown):
+    """
+    Donut of a Category | Amount frame
+    """
+    fig_pie = px.pie(
+        spending_breakdown,
+        values='Amount',
+        names='Category',
+        hole=0.5,
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    fig_pie.update_layout(**PIE_LAYOUT)
+    return fig_pie
+
+
+class FigureCache:
+    """
+    Small LRU of finished figures keyed by (chart, view, president / range ...). Thread safe - every session
+    shares it. Also keeps the serialized size of each figure so a rerun can add up what it sends to the browser.
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """
+        (figure, size in bytes) for key - build() only runs the first time a key is asked for.
+        Treat the figure as read only, it is shared.
+        """
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return entry
+        figure = build()
+        entry = (figure, len(pio.to_json(figure, validate=False)))
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = entry
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return entry
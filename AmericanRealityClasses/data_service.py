@@ -0,0 +1,182 @@
+# One copy of the app's data for the whole Streamlit process
+# Every browser session (and every page) asks this module for the data instead of building its own.
+# Frames are handed out as shallow copies - with pandas copy-on-write that is zero-copy, and if a page ever writes to
+# its copy pandas copies just that column for that page, so the shared data can never be changed by a viewer.
+# Network work (Treasury API, Tax Policy Center workbook) only ever happens on a background thread: visitors get the
+# last good snapshot right away (the local backups on a cold start) and the refresher swaps in a new one when ready.
+
+# imports
+import os
+import threading
+import pandas as pd
+from AmericanRealityClasses import TreasuryApi as TA
+from AmericanRealityClasses import fiscal_index as FI
+from AmericanRealityClasses import spending_cube as SC
+from AmericanRealityClasses.dashboard_figures import FigureCache
+from AmericanRealityClasses.Tax_Calculator import tax_logic as TL
+
+DEBT_URL = r'https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v2/accounting/od/debt_outstanding'
+PRESIDENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'USAPresidents.json')
+DEBT_BACKUP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'debt_backup.json')
+# same default (relative to where streamlit is started) as Treasury.getTaxPolicyDownload
+TAX_POLICY_FILE = r'resources/TaxPolicyCenterHistoricRevenues.xlsx'
+# both sources only change a few times a year - a few checks a day is plenty
+REFRESH_SECONDS = 6 * 60 * 60
+
+
+class FiscalSnapshot:
+    """
+    Everything the dashboard needs, built together so it always lines up:
+        fiscal_facts - year indexed Debt/Deficit/tax rate table
+        fiscal_idx   - FiscalIndex over fiscal_facts (read only arrays)
+        presidents   - USAPresidents.json
+        leaderboard  - every administration's scorecard
+        spending_cube - SpendingCube of outlays by budget function (None until the first MTS sync)
+        data_flag    - where the debt numbers came from: 'API', 'Back Up' (the API call failed) or
+                       'Local' (the files on disk at start up, before the first refresh has run)
+        figures      - FigureCache for charts drawn from this snapshot
+    The data is never modified after it is built.
+    """
+
+    def __init__(self, fiscal_facts, fiscal_idx, presidents, leaderboard, spending_cube, data_flag):
+        self.fiscal_facts = fiscal_facts
+        self.fiscal_idx = fiscal_idx
+        self.presidents = presidents
+        self.leaderboard = leaderboard
+        self.spending_cube = spending_cube
+        self.data_flag = data_flag
+        self.figures = FigureCache()
+
+    def views(self):
+        """
+        (fiscal_facts, fiscal_idx, presidents, leaderboard, spending_cube, data_flag, figures) for one rerun -
+        frames are shallow copies. That is only zero-copy AND safe because of pandas 3 Copy-on-Write (a page that
+        edits its view gets its own copy, the shared snapshot is never touched) - why requirements.txt pins pandas>=3
+        """
+        return (self.fiscal_facts.copy(deep=False), self.fiscal_idx, self.presidents.copy(deep=False),
+                self.leaderboard.copy(deep=False), self.spending_cube, self.data_flag, self.figures)
+
+
+class FiscalDataService:
+    def __init__(self, debt_url=DEBT_URL, presidents_file=PRESIDENTS_FILE, debt_backup_file=DEBT_BACKUP_FILE,
+                 tax_policy_file=TAX_POLICY_FILE, spending_backup_file=SC.SPENDING_BACKUP_FILE,
+                 refresh_seconds=REFRESH_SECONDS):
+        self.debt_url = debt_url
+        self.presidents_file = presidents_file
+        self.debt_backup_file = debt_backup_file
+        self.tax_policy_file = tax_policy_file
+        self.spending_backup_file = spending_backup_file
+        self.refresh_seconds = refresh_seconds
+        self.treasury = TA.Treasury()
+        # the tax tables are small and the Tax Calculator page needs them right away
+        self.tax_manager = TL.TaxDataManager()
+        # the dashboard data waits for the first page that asks for it
+        self._snapshot = None
+        self._lock = threading.Lock()
+        # background refresher
+        self._refresher = None
+        self._stop = threading.Event()
+
+    def fetch_snapshot(self):
+        """
+        Snapshot with the latest data - syncs the Treasury backups and checks the Tax Policy workbook (network)
+        """
+        debt, data_flag = self.treasury.getHistoricalDebtAPIData(self.debt_url, incremental=True,
+                                                                 storage_path=self.debt_backup_file)
+        deficits = self.treasury.getTaxPolicyDownload(self.tax_policy_file)
+        try:
+            SC.sync_spending_backup(TA.FiscalDataClient(self.treasury), self.spending_backup_file)
+        except ConnectionError as e:
+            print(f"API Connection Error: {e}. Using the last spending backup...")
+        return self.build_snapshot(debt, deficits, data_flag, SC.load_spending_cube(self.spending_backup_file))
+
+    def load_local_snapshot(self):
+        """
+        Snapshot from the files already on disk - never touches the network. Flagged 'Local' rather than
+        'Back Up' since nothing has failed yet, the refresher just hasn't finished its first pass
+        """
+        debt = self.treasury.loadDebtFrame(self.debt_backup_file)
+        if os.path.exists(self.tax_policy_file):
+            deficits = self.treasury.loadTaxPolicyFrame(self.tax_policy_file)
+        else:
+            deficits = pd.DataFrame()
+        return self.build_snapshot(debt, deficits, 'Local', SC.load_spending_cube(self.spending_backup_file))
+
+    def build_snapshot(self, debt, deficits, data_flag, spending_cube=None):
+        presidents = pd.read_json(self.presidents_file)
+
+        # min/max income tax rates per year
+        tax_extremes = self.tax_manager.get_annual_rate_extremes(status='single')
+
+        # ONE year indexed table with debt, deficit, surplus flag and High/Low tax rates - every view slices it
+        fiscal_facts = FI.build_fact_table(debt, deficits, tax_extremes)
+        # running totals + year lookup so every range's metrics are a few array reads
+        fiscal_idx = FI.FiscalIndex(fiscal_facts)
+        # every administration scored at once for the Leaderboard view
+        leaderboard = FI.build_leaderboard(presidents, fiscal_idx)
+
+        return FiscalSnapshot(fiscal_facts, fiscal_idx, presidents, leaderboard, spending_cube, data_flag)
+
+    def snapshot(self):
+        """
+        The current shared snapshot. The very first call builds it from the local files and starts the refresher
+        """
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self.load_local_snapshot()
+            self.start_refresher()
+        return self._snapshot
+
+    def refresh(self):
+        """
+        Fetch a new snapshot and swap it in. Returns False (and keeps serving the old one) if that fails
+        """
+        try:
+            snapshot = self.fetch_snapshot()
+        except Exception as e:
+            print(f"Data refresh failed: {e}. Keeping the last snapshot")
+            return False
+        if snapshot.fiscal_facts.empty and self._snapshot is not None and not self._snapshot.fiscal_facts.empty:
+            print("Data refresh came back empty. Keeping the last snapshot")
+            return False
+        # a single reference swap - a rerun sees the old snapshot or the new one, never half of each
+        self._snapshot = snapshot
+        return True
+
+    def start_refresher(self):
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name='fiscal-data-refresher',
+                                                   daemon=True)
+                self._refresher.start()
+
+    def stop_refresher(self, timeout=None):
+        """
+        Stops the background refresher (waits for a refresh that is already running to finish)
+        """
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout)
+
+    def _refresh_loop(self):
+        # refresh right away (the first snapshot came from disk), then on a schedule
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_seconds)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_data_service():
+    """
+    The process wide FiscalDataService (Python keeps this module loaded across reruns, sessions and pages)
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = FiscalDataService()
+    return _service
@@ -0,0 +1,194 @@
+# Year indexed fiscal facts for the dashboard
+# Debt (Treasury), deficits (Tax Policy Center) and the min/max income tax rates get lined up by year ONE time when
+# the data loads. After that a President or a Year range is just a contiguous slice of the table - no merges,
+# masks or lambdas on every click.
+
+# imports
+import numpy as np
+import pandas as pd
+
+FACT_COLUMNS = ['Debt', 'Deficit', 'Surplus', 'Def_Label', 'Low_Tax', 'High_Tax']
+
+
+def build_fact_table(debt, deficits, tax_extremes):
+    """
+    One row per fiscal year (sorted, no gaps in the index order) with:
+        Debt      - debt outstanding at the end of the year
+        Deficit   - surplus (+) or deficit (-) for the year
+        Surplus   - True when the year ran a surplus
+        Def_Label - 'Surplus' / 'Deficit' for hover labels
+        Low_Tax / High_Tax - lowest and highest marginal income tax rate in percent
+    debt is the cleaned Treasury frame, deficits the Tax Policy Center frame and tax_extremes the
+    Year | Lowest_Rate | Highest_Rate frame from TaxDataManager.get_annual_rate_extremes.
+    """
+    if debt.empty or deficits.empty:
+        return pd.DataFrame(columns=FACT_COLUMNS, index=pd.Index([], name='Year', dtype=int))
+
+    # 1843 has two records (the fiscal year start moved) - keep the later one so there is one row per year
+    debt_by_year = (debt.sort_values('record_date')
+                    .drop_duplicates('record_fiscal_year', keep='last')
+                    .set_index('record_fiscal_year')['debt_outstanding_amt'])
+    deficit_by_year = deficits.set_index('Fiscal Year')['Surplus or Deficit(-) Total']
+
+    facts = pd.DataFrame({'Debt': debt_by_year, 'Deficit': deficit_by_year})
+    facts.index = facts.index.astype(int)
+    facts = facts.sort_index().rename_axis('Year')
+
+    facts['Surplus'] = facts['Deficit'] > 0
+    facts['Def_Label'] = np.where(facts['Surplus'], 'Surplus', 'Deficit')
+
+    if tax_extremes.empty:
+        facts['Low_Tax'] = 0.0
+        facts['High_Tax'] = 0.0
+    else:
+        extremes = tax_extremes.set_index('Year')
+        facts['Low_Tax'] = extremes['Lowest_Rate'].reindex(facts.index)
+        facts['High_Tax'] = extremes['Highest_Rate'].reindex(facts.index)
+    return facts[FACT_COLUMNS]
+
+
+def fact_range(facts, start_year, end_year):
+    """
+    Rows for start_year..end_year (both included) as a Year | Debt | Deficit | ... frame for charts.
+    The index is sorted so this is a plain slice.
+    """
+    return facts.loc[start_year:end_year].reset_index()
+
+
+class FiscalIndex:
+    """
+    Prefix sums over the fact table so any [start, end] year range is a handful of array lookups:
+    debt at start/end, deficit at start/end, cumulative deficit and the 'stay the course' path.
+    Every method takes single years or arrays of years (to score every range at once).
+    """
+
+    def __init__(self, facts):
+        self.years = facts.index.to_numpy(dtype=int)
+        self.debt = facts['Debt'].to_numpy(dtype=float)
+        self.deficit = facts['Deficit'].to_numpy(dtype=float)
+        self.low_tax = facts['Low_Tax'].to_numpy(dtype=float)
+        self.high_tax = facts['High_Tax'].to_numpy(dtype=float)
+        # running total of deficits with a 0 in front - sum(start..end) = cumulative[end + 1] - cumulative[start]
+        self.cumulative_deficit = np.concatenate([[0.0], np.cumsum(np.nan_to_num(self.deficit))])
+        # same trick for how many years actually have a deficit - tells a real sum from one with holes in it
+        self.deficit_count = np.concatenate([[0], np.cumsum(~np.isnan(self.deficit))])
+        # year -> row lookup table (-1 = year not in the data)
+        self.first_year = int(self.years[0]) if len(self.years) else 0
+        self.position = np.full(int(self.years[-1]) - self.first_year + 1 if len(self.years) else 0, -1)
+        self.position[self.years - self.first_year] = np.arange(len(self.years))
+        # one index is shared by every session - nobody gets to write to it
+        for values in (self.years, self.debt, self.deficit, self.low_tax, self.high_tax,
+                       self.cumulative_deficit, self.deficit_count, self.position):
+            values.flags.writeable = False
+
+    def row_of(self, years):
+        """
+        Row number of each year, -1 if the year is not in the data
+        """
+        offsets = np.asarray(years, dtype=int) - self.first_year
+        if not len(self.position):
+            return np.full(offsets.shape, -1)
+        inside = (offsets >= 0) & (offsets < len(self.position))
+        return np.where(inside, self.position[np.clip(offsets, 0, len(self.position) - 1)], -1)
+
+    def range_metrics_batch(self, start_years, end_years, missing=0.0):
+        """
+        Fiscal metrics for many [start, end] ranges at once. Returns a dict of arrays:
+            beginning_debt, ending_debt, total_debt_change, beginning_deficit, ending_deficit, deficit_growth,
+            cumulative_deficit, term_length, hypothetical_total_deficit, hypothetical_ending_debt,
+            responsibility_gap, found (both the start and end year are in the data),
+            deficit_complete (every year of the range has a deficit)
+        Start/end years that are not in the data use `missing` for their debt and deficit.
+        cumulative_deficit is `missing` unless deficit_complete - a sum with years left out would understate it.
+        """
+        start_years = np.asarray(start_years, dtype=int)
+        end_years = np.asarray(end_years, dtype=int)
+        start_rows = self.row_of(start_years)
+        end_rows = self.row_of(end_years)
+
+        def value_at(values, rows):
+            return np.where(rows >= 0, values[np.maximum(rows, 0)], missing) if len(values) else np.full(rows.shape, missing)
+
+        beginning_debt = value_at(self.debt, start_rows)
+        ending_debt = value_at(self.debt, end_rows)
+        beginning_deficit = value_at(self.deficit, start_rows)
+        ending_deficit = value_at(self.deficit, end_rows)
+
+        # rows inside the range, even if the exact start/end year is missing
+        first_row = np.searchsorted(self.years, start_years, side='left')
+        after_last_row = np.maximum(np.searchsorted(self.years, end_years, side='right'), first_row)
+        deficit_years = self.deficit_count[after_last_row] - self.deficit_count[first_row]
+        deficit_complete = deficit_years == end_years - start_years + 1
+        cumulative_deficit = np.where(deficit_complete,
+                                      self.cumulative_deficit[after_last_row] - self.cumulative_deficit[first_row],
+                                      missing)
+
+        # 'stay the course' - keep running the inherited deficit every year of the term
+        term_length = end_years - start_years
+        hypothetical_total_deficit = beginning_deficit * term_length
+        hypothetical_ending_debt = beginning_debt - hypothetical_total_deficit
+
+        return {
+            'beginning_debt': beginning_debt,
+            'ending_debt': ending_debt,
+            'total_debt_change': ending_debt - beginning_debt,
+            'beginning_deficit': beginning_deficit,
+            'ending_deficit': ending_deficit,
+            'deficit_growth': ending_deficit - beginning_deficit,
+            'cumulative_deficit': cumulative_deficit,
+            'term_length': term_length,
+            'hypothetical_total_deficit': hypothetical_total_deficit,
+            'hypothetical_ending_debt': hypothetical_ending_debt,
+            'responsibility_gap': ending_debt - hypothetical_ending_debt,
+            'found': (start_rows >= 0) & (end_rows >= 0),
+            'deficit_complete': deficit_complete
+        }
+
+    def range_metrics(self, start_year, end_year, missing=0.0):
+        """
+        Same as range_metrics_batch for a single range - plain numbers out
+        """
+        batch = self.range_metrics_batch([start_year], [end_year], missing=missing)
+        return {name: values[0].item() for name, values in batch.items()}
+
+    def tax_range_batch(self, start_years, end_years):
+        """
+        Lowest Low_Tax and highest High_Tax inside each [start, end] range (nan when the range has no rates).
+        Terms overlap (one ends the year the next starts) so this is a years x ranges mask instead of reduceat.
+        """
+        start_years = np.asarray(start_years, dtype=int)
+        end_years = np.asarray(end_years, dtype=int)
+        inside = (self.years[:, None] >= start_years) & (self.years[:, None] <= end_years)
+
+        # years outside the range (or without rates) become +/-inf so they never win, all inf = no rates at all
+        low_tax = np.nan_to_num(self.low_tax, nan=np.inf)[:, None]
+        high_tax = np.nan_to_num(self.high_tax, nan=-np.inf)[:, None]
+        lowest = np.where(inside, low_tax, np.inf).min(axis=0, initial=np.inf)
+        highest = np.where(inside, high_tax, -np.inf).max(axis=0, initial=-np.inf)
+        return np.where(np.isinf(lowest), np.nan, lowest), np.where(np.isinf(highest), np.nan, highest)
+
+
+def build_leaderboard(presidents, fiscal_idx):
+    """
+    Every administration's fiscal scorecard in one pass - the same numbers as the President view lined up in a
+    sortable table. A term whose start/end year is not in the data yet gets blanks instead of 0 so it sorts last
+    instead of looking like the debt was paid off:
+        President | Party | Start | End | Debt Change | Term Deficit | Net Fiscal Impact | Min Tax | Max Tax
+    """
+    start_years = presidents['start_year'].to_numpy(dtype=int)
+    end_years = presidents['end_year'].to_numpy(dtype=int)
+
+    metrics = fiscal_idx.range_metrics_batch(start_years, end_years, missing=np.nan)
+    min_tax, max_tax = fiscal_idx.tax_range_batch(start_years, end_years)
+
+    return pd.DataFrame({
+        'President': presidents['name'].to_numpy(),
+        'Party': presidents['party'].to_numpy(),
+        'Start': start_years,
+        'End': end_years,
+        'Debt Change': metrics['total_debt_change'],
+        'Term Deficit': metrics['cumulative_deficit'],
+        'Net Fiscal Impact': metrics['responsibility_gap'],
+        'Min Tax': min_tax,
+        'Max Tax': max_tax
+    })
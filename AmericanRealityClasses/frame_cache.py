@@ -0,0 +1,106 @@
+# Typed on-disk cache for cleaned DataFrames
+# The JSON/xlsx files stay the import/export format - this just keeps the already cleaned frame in Arrow Feather
+# so a cold start can memory map it instead of parsing and re-casting everything again.
+# Every cache carries a small metadata dict (schema version, source file hash, ...). If anything in it does not
+# match what the caller expects the cache counts as stale and the caller rebuilds it from the source file.
+    # https://arrow.apache.org/docs/python/feather.html
+
+# imports
+import hashlib
+import json
+import os
+
+# pyarrow is what pandas uses for feather - without it we just skip caching and use the source files
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+METADATA_KEY = b'usa_cash_flows'
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    sha256 of a file, read in chunks so big workbooks do not get loaded into memory at once
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(source_path, suffix):
+    """
+    Cache files live right next to their source ex: debt_backup.json -> debt_backup.feather
+    """
+    return os.path.splitext(source_path)[0] + suffix
+
+
+def read_frame_cache(cache_path, expected_metadata):
+    """
+    Memory maps a cached frame. Returns None when there is no cache, pyarrow is missing or any
+    expected_metadata value does not match (old schema version, source file changed ...)
+    """
+    if feather is None or not os.path.exists(cache_path):
+        return None
+    try:
+        table = feather.read_table(cache_path, memory_map=True)
+        raw = (table.schema.metadata or {}).get(METADATA_KEY)
+        metadata = json.loads(raw) if raw else {}
+        if any(metadata.get(key) != value for key, value in expected_metadata.items()):
+            return None
+        return table.to_pandas()
+    except Exception as e:
+        print(f"Cache read failed for {cache_path}: {e}")
+        return None
+
+
+def write_frame_cache(df, cache_path, metadata):
+    """
+    Saves a frame + metadata as uncompressed feather (uncompressed so it can be memory mapped on load).
+    Written to a temp file first and renamed so a reader never sees half a file.
+    """
+    if feather is None:
+        return False
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[METADATA_KEY] = json.dumps(metadata).encode()
+        feather.write_feather(table.replace_schema_metadata(schema_metadata), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+        return True
+    except Exception as e:
+        print(f"Cache write failed for {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def load_or_build(source_path, cache_path, schema_version, build):
+    """
+    Cached version of build(source_path) for slow-to-parse source files (xlsx).
+    Checks the source's mtime + size first (no read at all), then its hash in case the file was only touched,
+    and only calls build when the content really changed. build should return a DataFrame - empty means failed.
+    """
+    file_stat = os.stat(source_path)
+    metadata = {'schema_version': schema_version,
+                'source_mtime': file_stat.st_mtime,
+                'source_size': file_stat.st_size}
+
+    df = read_frame_cache(cache_path, metadata)
+    if df is not None:
+        return df
+
+    # mtime moved (git checkout, same file downloaded again ...) - the hash says if the content did
+    metadata['source_hash'] = file_hash(source_path)
+    df = read_frame_cache(cache_path, {'schema_version': schema_version, 'source_hash': metadata['source_hash']})
+    if df is None:
+        df = build(source_path)
+    if not df.empty:
+        # save with the new mtime so the next start takes the fast path
+        write_frame_cache(df, cache_path, metadata)
+    return df
@@ -0,0 +1,74 @@
+# Running totals for the ledger sheets
+# The ledger only ever grows (a new donation / expense is a new row at the bottom), so every refresh does not need to
+# add the whole sheet up again. The aggregator remembers a hash of every row it already counted: rows past that are
+# folded into the running total and the per-month rollup, and if any earlier row changed (an edit, a deleted row,
+# a re-sorted sheet) it throws the totals away and counts everything again.
+
+# imports
+import numpy as np
+import pandas as pd
+
+
+class LedgerAggregator:
+    """
+    Running total and per-month totals of one ledger sheet.
+        total      - sum of the amount column
+        monthly    - 'YYYY-MM' -> sum of the amounts dated in that month (rows without a usable date are left out)
+        row_count  - rows counted so far
+        full_recomputes - how many times an edit forced counting from scratch (for the curious)
+    """
+
+    def __init__(self, amount_column='Amount', date_column='Date'):
+        self.amount_column = amount_column
+        self.date_column = date_column
+        self.reset()
+        self.full_recomputes = 0
+
+    def reset(self):
+        self.row_hashes = np.empty(0, dtype=np.uint64)
+        self.total = 0.0
+        self.monthly = {}
+
+    @property
+    def row_count(self):
+        return len(self.row_hashes)
+
+    @staticmethod
+    def hash_rows(df):
+        # one vectorized pass - the only work that still looks at every row
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    def update(self, df):
+        """
+        Brings the totals up to date with the sheet frame df. Returns the number of rows folded in
+        (= len(df) after a full recompute). A column changing type (ex: Amount turning from ints to floats)
+        changes every row's hash, which just means one full recompute.
+        """
+        hashes = self.hash_rows(df)
+        seen = self.row_count
+        if len(hashes) < seen or not np.array_equal(hashes[:seen], self.row_hashes):
+            # an earlier row is different - the running totals can't be trusted anymore
+            self.reset()
+            self.full_recomputes += 1
+            seen = 0
+
+        self.fold(df.iloc[seen:])
+        self.row_hashes = hashes
+        return len(df) - seen
+
+    def fold(self, rows):
+        if rows.empty:
+            return
+        amounts = pd.to_numeric(rows[self.amount_column])
+        self.total += float(amounts.sum())
+
+        if self.date_column in rows.columns:
+            months = pd.to_datetime(rows[self.date_column], errors='coerce').dt.strftime('%Y-%m')
+            for month, amount in amounts.groupby(months).sum().items():
+                self.monthly[month] = self.monthly.get(month, 0.0) + float(amount)
+
+    def monthly_frame(self):
+        """
+        Month | Amount frame sorted by month
+        """
+        return pd.DataFrame(sorted(self.monthly.items()), columns=['Month', 'Amount'])
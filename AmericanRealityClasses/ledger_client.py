@@ -0,0 +1,195 @@
+# Live Donation & Expense ledger (Google Sheets for now)
+# The two sheets are read through the gviz export (the data comes back as a CSV) - both at the same time, each with
+# a timeout. The last good copy is saved to disk so a page load never waits on Google: visitors get the copy we
+# already have right away and a background thread fetches a newer one when it is more than a minute old.
+# If Google is down the last good numbers stay up instead of dropping to $0.
+# Totals are kept up to date by folding in just the new rows (see ledger_aggregate).
+
+# imports
+import io
+import json
+import os
+import threading
+import time
+import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from AmericanRealityClasses.ledger_aggregate import LedgerAggregator
+
+LEDGER_SHEET_ID = "1Cma1Wdk4yYLq5fiPDG5YCythxEwYnqBPh0Zplro3mD4"
+# Use the export format to get the data directly as a CSV
+LEDGER_SHEET_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}"
+LEDGER_SHEETS = ['Donations', 'Expenses']
+LEDGER_SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'ledger_snapshot.json')
+# Only check the sheet once per minute
+LEDGER_REFRESH_SECONDS = 60
+LEDGER_TIMEOUT = 5
+
+
+def ledger_urls(sheet_id=LEDGER_SHEET_ID, sheets=LEDGER_SHEETS):
+    """
+    sheet name -> gviz csv url
+    """
+    return {sheet: LEDGER_SHEET_URL.format(sheet_id=sheet_id, sheet=sheet) for sheet in sheets}
+
+
+def parse_ledger_csv(csv_text):
+    """
+    Sheet csv -> frame with clean column names (removes spaces/quotes) and a numeric Amount column.
+    Raises ValueError if the sheet has no usable Amount column - a broken sheet should not count as $0
+    """
+    df = pd.read_csv(io.StringIO(csv_text))
+    df.columns = df.columns.str.strip()
+    if 'Amount' not in df.columns:
+        raise ValueError("Ledger sheet has no 'Amount' column")
+    df['Amount'] = pd.to_numeric(df['Amount'])
+    return df
+
+
+class LedgerSnapshot:
+    """
+    One read of both sheets:
+        donations / expenses - the sheet frames
+        total_donations / total_expenses - Amount totals
+        monthly_donations / monthly_expenses - Month | Amount frames
+        fetched_at - when the sheets were read (epoch seconds, None = never)
+        source     - 'live' (this process fetched it), 'disk' (last good copy) or 'none'
+    """
+
+    def __init__(self, csv_texts, fetched_at, source, sheets=None, totals=None, monthly=None):
+        self.csv_texts = csv_texts
+        self.fetched_at = fetched_at
+        self.source = source
+        sheets, totals, monthly = sheets or {}, totals or {}, monthly or {}
+        self.donations = sheets.get('Donations', pd.DataFrame())
+        self.expenses = sheets.get('Expenses', pd.DataFrame())
+        self.total_donations = totals.get('Donations', 0.0)
+        self.total_expenses = totals.get('Expenses', 0.0)
+        self.monthly_donations = monthly.get('Donations', pd.DataFrame(columns=['Month', 'Amount']))
+        self.monthly_expenses = monthly.get('Expenses', pd.DataFrame(columns=['Month', 'Amount']))
+
+    def age(self):
+        return time.time() - self.fetched_at if self.fetched_at is not None else float('inf')
+
+
+class LedgerClient:
+    def __init__(self, urls=None, snapshot_file=LEDGER_SNAPSHOT_FILE, refresh_seconds=LEDGER_REFRESH_SECONDS,
+                 timeout=LEDGER_TIMEOUT):
+        # sheet name -> csv url (point these at a local server to try it offline)
+        self.urls = urls if urls is not None else ledger_urls()
+        self.snapshot_file = snapshot_file
+        self.refresh_seconds = refresh_seconds
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._snapshot = None
+        self._lock = threading.Lock()
+        # the one background fetch allowed at a time
+        self._refresher = None
+        # a failed fetch waits refresh_seconds before the next try too
+        self.last_attempt = 0.0
+        # running totals per sheet - a refresh only adds the rows that are new since the last one
+        self.aggregators = {sheet: LedgerAggregator() for sheet in self.urls}
+        self._aggregate_lock = threading.Lock()
+
+    def fetch_sheet(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_snapshot(self):
+        """
+        Reads every sheet at the same time (network). Raises if any sheet fails so a half ledger is never shown
+        """
+        with ThreadPoolExecutor(max_workers=len(self.urls)) as pool:
+            futures = {sheet: pool.submit(self.fetch_sheet, url) for sheet, url in self.urls.items()}
+            csv_texts = {sheet: future.result() for sheet, future in futures.items()}
+        return self.build_snapshot(csv_texts, time.time(), 'live')
+
+    def build_snapshot(self, csv_texts, fetched_at, source):
+        """
+        Parses the sheet csvs and brings the running totals up to date with them
+        """
+        # parse everything first - a bad sheet should not leave the totals half updated
+        sheets = {sheet: parse_ledger_csv(csv_texts[sheet]) for sheet in self.urls}
+        with self._aggregate_lock:
+            for sheet, df in sheets.items():
+                self.aggregators[sheet].update(df)
+            totals = {sheet: aggregator.total for sheet, aggregator in self.aggregators.items()}
+            monthly = {sheet: aggregator.monthly_frame() for sheet, aggregator in self.aggregators.items()}
+        return LedgerSnapshot(csv_texts, fetched_at, source, sheets, totals, monthly)
+
+    def load_local_snapshot(self):
+        """
+        Last good copy from disk - empty ledger if there is none (or it is unreadable)
+        """
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                saved = json.load(f)
+            return self.build_snapshot(saved['sheets'], saved['fetched_at'], 'disk')
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(self.snapshot_file):
+                print(f"Ledger backup unreadable: {e}. Starting empty...")
+            return LedgerSnapshot({}, None, 'none')
+
+    def save_snapshot(self, snapshot):
+        # temp file + rename - another session may be reading the old copy
+        tmp_path = f"{self.snapshot_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'fetched_at': snapshot.fetched_at, 'sheets': snapshot.csv_texts}, f)
+        os.replace(tmp_path, self.snapshot_file)
+
+    def refresh(self):
+        """
+        Fetch the sheets and swap in the new snapshot. Returns False (and keeps the last good one) if that fails
+        """
+        self.last_attempt = time.time()
+        try:
+            snapshot = self.fetch_snapshot()
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Ledger refresh failed: {e}. Keeping the last good ledger")
+            return False
+        self._snapshot = snapshot
+        try:
+            self.save_snapshot(snapshot)
+        except OSError as e:
+            print(f"Could not save the ledger backup: {e}")
+        return True
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._refresher = threading.Thread(target=self.refresh, name='ledger-refresher', daemon=True)
+                self._refresher.start()
+
+    def snapshot(self):
+        """
+        The ledger to show right now. Never waits on the network except on the very first start with no saved copy
+        (then one fetch, bounded by the timeout). A stale copy kicks off a background refresh.
+        """
+        if self._snapshot is None:
+            cold_start = False
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self.load_local_snapshot()
+                    cold_start = self._snapshot.source == 'none'
+            if cold_start:
+                self.refresh()
+        if self._snapshot.age() >= self.refresh_seconds and time.time() - self.last_attempt >= self.refresh_seconds:
+            self.refresh_in_background()
+        return self._snapshot
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_ledger_client():
+    """
+    The process wide LedgerClient - every session reads the same copy of the ledger
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LedgerClient()
+    return _client
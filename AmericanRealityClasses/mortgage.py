@@ -0,0 +1,175 @@
+# Mortgage math for the Mortgage Repayments Calculator (started in Extra TAb ideas/Mortgae_calculator.py)
+# The whole payment schedule comes from the closed-form balance formula applied to every month at once (numpy),
+# instead of walking the loan one month at a time:
+#     balance after month k = (1 + r)^k * (loan - sum of payment_j / (1 + r)^j for j <= k)
+# which works for any payment per month, so extra payments (monthly or one-off lump sums) and a 0% rate
+# (balance = loan - payments so far) need no loop either.
+
+# imports
+import numpy as np
+import pandas as pd
+
+MONTHS_PER_YEAR = 12
+# a balance under half a cent is paid off (rounding left over from the formula)
+PAID_OFF_TOLERANCE = 0.005
+SCHEDULE_COLUMNS = ["Month", "Payment", "Principal", "Interest", "Remaining Balance", "Year"]
+
+
+def monthly_rate(interest_rate):
+    """
+    Annual rate in percent (5.5 = 5.5%) -> monthly rate as a fraction
+    """
+    return (np.asarray(interest_rate, dtype=float) / 100) / MONTHS_PER_YEAR
+
+
+def monthly_payment(loan_amount, interest_rate, loan_term):
+    """
+    Fixed monthly payment that pays loan_amount off over loan_term years at interest_rate percent.
+    Takes numbers or numpy arrays (they broadcast against each other).
+    """
+    loan_amount = np.asarray(loan_amount, dtype=float)
+    rate = monthly_rate(interest_rate)
+    number_of_payments = np.asarray(loan_term, dtype=float) * MONTHS_PER_YEAR
+    # 0% loans are just the loan split evenly - the usual formula would divide by 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = loan_amount * rate / (1 - (1 + rate) ** -number_of_payments)
+    return np.where(rate == 0, loan_amount / number_of_payments, payment)
+
+
+def amortize(loan_amount, interest_rate, loan_term, extra_payment=0.0):
+    """
+    Month by month schedule for one loan, all numpy arrays (one entry per month until the loan is paid off):
+        month, payment, principal, interest, balance (remaining after the payment), year
+    plus monthly_payment (the required payment), payoff_month, total_paid and total_interest.
+    extra_payment is paid on top of the required payment - one number for every month, or an array with one entry
+    per month of the full term (ex: a lump sum in month 24). The last payment only covers what is left.
+    """
+    # a deposit bigger than the home leaves nothing to borrow
+    loan_amount = max(float(loan_amount), 0.0)
+    number_of_payments = int(round(loan_term * MONTHS_PER_YEAR))
+    rate = float(monthly_rate(interest_rate))
+    required = float(monthly_payment(loan_amount, interest_rate, loan_term))
+    months = np.arange(1, number_of_payments + 1)
+    scheduled = required + np.broadcast_to(np.asarray(extra_payment, dtype=float), (number_of_payments,))
+
+    if rate == 0:
+        balance = loan_amount - np.cumsum(scheduled)
+    else:
+        growth = (1 + rate) ** months
+        balance = growth * (loan_amount - np.cumsum(scheduled / growth))
+    balance = np.where(balance < PAID_OFF_TOLERANCE, 0.0, balance)
+
+    # keep the months up to (and including) the one that pays it off
+    paid_off = np.flatnonzero(balance == 0)
+    payoff_month = int(paid_off[0]) + 1 if len(paid_off) else number_of_payments
+    months, balance = months[:payoff_month], balance[:payoff_month]
+
+    opening_balance = np.concatenate([[loan_amount], balance[:-1]])
+    interest = opening_balance * rate
+    # whatever the payment did not spend on interest came off the balance
+    principal = opening_balance - balance
+    payment = principal + interest
+
+    return {
+        'month': months,
+        'payment': payment,
+        'principal': principal,
+        'interest': interest,
+        'balance': balance,
+        'year': (months - 1) // MONTHS_PER_YEAR + 1,
+        'monthly_payment': required,
+        'payoff_month': payoff_month,
+        'total_paid': float(payment.sum()),
+        'total_interest': float(interest.sum())
+    }
+
+
+def yearly_rollup(schedule):
+    """
+    Year | Payment | Principal | Interest | Remaining Balance totals per loan year - the months are in order and
+    every year is 12 of them, so each year is a reduceat slice (no groupby)
+    """
+    year_starts = np.arange(0, len(schedule['month']), MONTHS_PER_YEAR)
+    year_ends = np.minimum(year_starts + MONTHS_PER_YEAR, len(schedule['month'])) - 1
+    return pd.DataFrame({
+        'Year': schedule['year'][year_starts],
+        'Payment': np.add.reduceat(schedule['payment'], year_starts),
+        'Principal': np.add.reduceat(schedule['principal'], year_starts),
+        'Interest': np.add.reduceat(schedule['interest'], year_starts),
+        'Remaining Balance': schedule['balance'][year_ends]
+    })
+
+
+def schedule_frame(schedule):
+    """
+    The schedule as the prototype's Month | Payment | Principal | Interest | Remaining Balance | Year frame
+    """
+    return pd.DataFrame({
+        'Month': schedule['month'],
+        'Payment': schedule['payment'],
+        'Principal': schedule['principal'],
+        'Interest': schedule['interest'],
+        'Remaining Balance': schedule['balance'],
+        'Year': schedule['year']
+    }, columns=SCHEDULE_COLUMNS)
+
+
+def scenario_grid(home_value, interest_rates, loan_terms, deposits, curve_step=MONTHS_PER_YEAR, curves=True):
+    """
+    Every (interest rate, loan term, deposit) combination for one home at once - the payment formula on
+    broadcast arrays, axis 0 = interest_rates, axis 1 = loan_terms, axis 2 = deposits:
+        monthly_payment, total_paid, total_interest - (rates, terms, deposits) arrays
+        loan_amount  - one per deposit
+        curve_months - months the payoff curves are sampled at (every curve_step months, 0 to the longest term)
+        balance_curves - (rates, terms, deposits, len(curve_months)) balance left at each sampled month
+                         (0 after the loan is paid off) - skipped with curves=False
+        nbytes - memory held by the arrays above
+    """
+    interest_rates = np.asarray(interest_rates, dtype=float)
+    loan_terms = np.asarray(loan_terms, dtype=float)
+    deposits = np.asarray(deposits, dtype=float)
+    loan_amount = np.maximum(home_value - deposits, 0.0)
+
+    rates = interest_rates[:, None, None]
+    terms = loan_terms[None, :, None]
+    loans = loan_amount[None, None, :]
+    payment = monthly_payment(loans, rates, terms)
+    total_paid = payment * terms * MONTHS_PER_YEAR
+    grid = {
+        'interest_rate': interest_rates,
+        'loan_term': loan_terms,
+        'deposit': deposits,
+        'loan_amount': loan_amount,
+        'monthly_payment': payment,
+        'total_paid': total_paid,
+        'total_interest': total_paid - loans
+    }
+
+    if curves:
+        curve_months = np.arange(0, int(round(loan_terms.max() * MONTHS_PER_YEAR)) + 1, curve_step)
+        # balance after k months = loan * (1 + r)^k - payment * ((1 + r)^k - 1) / r   (loan - payment * k at 0%)
+        # the (1 + r)^k parts only depend on the rate, so they stay (rates, 1, 1, months) small
+        rate = monthly_rate(interest_rates)[:, None, None, None]
+        growth = (1 + rate) ** curve_months
+        with np.errstate(divide='ignore', invalid='ignore'):
+            paid_down = np.where(rate == 0, curve_months, (growth - 1) / rate)
+        # one full size array, worked on in place
+        balance = payment[..., None] * paid_down
+        np.subtract(loans[..., None] * growth, balance, out=balance)
+        # past the end of the term the formula goes negative - that is a paid off loan
+        np.maximum(balance, 0.0, out=balance)
+        balance[balance < PAID_OFF_TOLERANCE] = 0.0
+        grid['curve_months'] = curve_months
+        grid['balance_curves'] = balance
+
+    grid['nbytes'] = sum(values.nbytes for values in grid.values())
+    return grid
+
+
+def grid_table(grid, value='monthly_payment', deposit_index=0):
+    """
+    interest rate x loan term frame of one grid value for one deposit - ready for a heatmap
+    """
+    return pd.DataFrame(grid[value][:, :, deposit_index],
+                        index=pd.Index(grid['interest_rate'], name='Interest Rate (%)'),
+                        columns=pd.Index(grid['loan_term'], name='Loan Term (years)'))
@@ -0,0 +1,144 @@
+# Where did the money go - federal outlays by budget function for every fiscal year
+# source: Monthly Treasury Statement table 9 (Fiscal Data api, FY2015 on)
+    # https://fiscaldata.treasury.gov/datasets/monthly-treasury-statement/summary-of-receipts-and-outlays-of-the-u-s-government
+    # the September statement's fiscal-year-to-date column is the whole fiscal year
+# The raw rows are kept in a json backup (same idea as debt_backup.json) and boiled down ONE time into a
+# year x category cube saved as feather. A President or a Year range is then a slice of the cube's running totals -
+# no api call, no groupby when someone picks a president.
+
+# imports
+import json
+import os
+import numpy as np
+import pandas as pd
+from AmericanRealityClasses import frame_cache
+from AmericanRealityClasses.TreasuryApi import FiscalDataClient, DATASET_DTYPES, MTS_TABLE_9_DATASET
+
+SPENDING_BACKUP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'mts_outlays_backup.json')
+# bump this when build_cube_frame changes so old cubes get rebuilt
+SPENDING_CUBE_SCHEMA_VERSION = 1
+MTS_FIELDS = ['record_date', 'record_fiscal_year', 'record_calendar_month', 'classification_desc',
+              'current_fytd_rcpt_outly_amt']
+FISCAL_YEAR_END_MONTH = 9
+
+# budget function (as the MTS names it) -> pie slice
+# 'Undistributed Offsetting Receipts' is left out - it is a negative accounting offset, not a program
+FUNCTION_CATEGORIES = {
+    'Social Security': 'Social Security',
+    'Health': 'Health (Medicare/Medicaid)',
+    'Medicare': 'Health (Medicare/Medicaid)',
+    'National Defense': 'National Defense',
+    'Net Interest': 'Interest on Debt',
+    'Income Security': 'Income Security',
+    'Veterans Benefits and Services': 'Veterans Benefits',
+    'International Affairs': 'Other Services',
+    'General Science, Space, and Technology': 'Other Services',
+    'Energy': 'Other Services',
+    'Natural Resources and Environment': 'Other Services',
+    'Agriculture': 'Other Services',
+    'Commerce and Housing Credit': 'Other Services',
+    'Transportation': 'Other Services',
+    'Community and Regional Development': 'Other Services',
+    'Education, Training, Employment, and Social Services': 'Other Services',
+    'Administration of Justice': 'Other Services',
+    'General Government': 'Other Services'
+}
+CATEGORIES = ['Social Security', 'Health (Medicare/Medicaid)', 'National Defense', 'Interest on Debt',
+              'Income Security', 'Veterans Benefits', 'Other Services']
+
+
+def load_spending_backup(backup_path=SPENDING_BACKUP_FILE):
+    """
+    Raw MTS rows saved by the last sync, empty list if there is no usable file
+    """
+    if os.path.exists(backup_path) and os.path.getsize(backup_path):
+        with open(backup_path, 'r') as f:
+            return json.load(f).get('data', [])
+    return []
+
+
+def sync_spending_backup(client=None, backup_path=SPENDING_BACKUP_FILE):
+    """
+    Pulls the September (full fiscal year) rows of MTS table 9 and replaces the backup. It is a few hundred rows
+    so one request covers every year. Raises ConnectionError if the api is down (the old backup stays).
+    """
+    client = client if client is not None else FiscalDataClient()
+    data = []
+    for page in client.iterPages(MTS_TABLE_9_DATASET, fields=MTS_FIELDS,
+                                 filters=f"record_calendar_month:eq:{FISCAL_YEAR_END_MONTH:02d}"):
+        data.extend(page['data'])
+    if data:
+        # temp file + rename - the app may be reading the old backup at the same time
+        tmp_path = f"{backup_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"data": data}, f)
+        os.replace(tmp_path, backup_path)
+    return data
+
+
+def build_cube_frame(records):
+    """
+    Raw MTS rows -> one row per fiscal year, one column per CATEGORIES entry (dollars)
+    """
+    df = FiscalDataClient.castRecords(records, DATASET_DTYPES[MTS_TABLE_9_DATASET])
+    if df.empty:
+        return pd.DataFrame(columns=CATEGORIES)
+    df['classification_desc'] = df['classification_desc'].str.strip()
+    df = df[(df['record_calendar_month'] == FISCAL_YEAR_END_MONTH) &
+            df['classification_desc'].isin(FUNCTION_CATEGORIES.keys())]
+    # one row per function per year (the first one if a statement ever repeats a name)
+    df = df.drop_duplicates(['record_fiscal_year', 'classification_desc'])
+    df['Category'] = df['classification_desc'].map(FUNCTION_CATEGORIES)
+
+    cube = df.pivot_table(index='record_fiscal_year', columns='Category', values='current_fytd_rcpt_outly_amt',
+                          aggfunc='sum')
+    cube = cube.reindex(columns=CATEGORIES).fillna(0.0).sort_index().rename_axis('Year')
+    cube.columns.name = None
+    return cube
+
+
+def load_spending_cube(backup_path=SPENDING_BACKUP_FILE):
+    """
+    SpendingCube from the feather cube next to the backup (rebuilt only when the backup changes),
+    None when there is no backup yet
+    """
+    if not (os.path.exists(backup_path) and os.path.getsize(backup_path)):
+        return None
+    cube_path = frame_cache.cache_path_for(backup_path, '_cube.feather')
+    cube = frame_cache.load_or_build(backup_path, cube_path, SPENDING_CUBE_SCHEMA_VERSION,
+                                     lambda path: build_cube_frame(load_spending_backup(path)))
+    return SpendingCube(cube) if not cube.empty else None
+
+
+class SpendingCube:
+    """
+    Year x category outlays with running totals down the years, so the spending for any [start, end]
+    range is one subtraction per category.
+    """
+
+    def __init__(self, cube):
+        self.years = cube.index.to_numpy(dtype=int)
+        self.categories = list(cube.columns)
+        self.values = cube.to_numpy(dtype=float)
+        # running totals with a row of 0s in front - sum(start..end) = cumulative[end + 1] - cumulative[start]
+        self.cumulative = np.vstack([np.zeros((1, len(self.categories))), np.cumsum(self.values, axis=0)])
+        # shared by every session - read only
+        for values in (self.years, self.values, self.cumulative):
+            values.flags.writeable = False
+
+    def breakdown(self, start_year, end_year):
+        """
+        Average yearly outlays per category for the fiscal years in [start_year, end_year] we have data for:
+            {'breakdown': Category | Amount frame, 'first_year', 'last_year'}
+        None if the range has no data (ex: before the MTS api starts)
+        """
+        first_row = np.searchsorted(self.years, start_year, side='left')
+        after_last_row = np.searchsorted(self.years, end_year, side='right')
+        if after_last_row <= first_row:
+            return None
+        average = (self.cumulative[after_last_row] - self.cumulative[first_row]) / (after_last_row - first_row)
+        return {
+            'breakdown': pd.DataFrame({'Category': self.categories, 'Amount': np.maximum(average, 0.0)}),
+            'first_year': int(self.years[first_row]),
+            'last_year': int(self.years[after_last_row - 1])
+        }
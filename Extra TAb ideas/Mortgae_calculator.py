@@ -1,6 +1,17 @@
+import os
+import sys
+import numpy as np
+import plotly.express as px
 import streamlit as st
-import pandas as pd
-import math
+
+# Get the path to the 'USA_Cash_Flows' root directory
+# parent is: USA_Cash_Flows/Extra TAb ideas - two levels back
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the root to sys.path so `streamlit run` can find our classes from this folder
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from AmericanRealityClasses import mortgage as MG
 
 st.title("Mortgage Repayments Calculator")
 
@@ -8,56 +19,35 @@ st.write("### Input Data")
 col1, col2 = st.columns(2)
 home_value = col1.number_input("Home Value", min_value=0, value=500000)
 deposit = col1.number_input("Deposit", min_value=0, value=100000)
+extra_payment = col1.number_input("Extra Monthly Payment", min_value=0, value=0)
 interest_rate = col2.number_input("Interest Rate (in %)", min_value=0.0, value=5.5)
 loan_term = col2.number_input("Loan Term (in years)", min_value=1, value=30)
 
-# Calculate the repayments.
+# Calculate the repayments (the whole schedule at once - see AmericanRealityClasses/mortgage.py)
 loan_amount = home_value - deposit
-monthly_interest_rate = (interest_rate / 100) / 12
-number_of_payments = loan_term * 12
-monthly_payment = (
-    loan_amount
-    * (monthly_interest_rate * (1 + monthly_interest_rate) ** number_of_payments)
-    / ((1 + monthly_interest_rate) ** number_of_payments - 1)
-)
+schedule = MG.amortize(loan_amount, interest_rate, loan_term, extra_payment=extra_payment)
+monthly_payment = schedule['monthly_payment']
 
 # Display the repayments.
-total_payments = monthly_payment * number_of_payments
-total_interest = total_payments - loan_amount
+total_payments = schedule['total_paid']
+total_interest = schedule['total_interest']
 
 st.write("### Repayments")
 col1, col2, col3 = st.columns(3)
-col1.metric(label="Monthly Repayments", value=f"${monthly_payment:,.2f}")
+col1.metric(label="Monthly Repayments", value=f"${monthly_payment + extra_payment:,.2f}")
 col2.metric(label="Total Repayments", value=f"${total_payments:,.0f}")
 col3.metric(label="Total Interest", value=f"${total_interest:,.0f}")
+if extra_payment:
+    st.caption(f"Paid off in {schedule['payoff_month'] / 12:.1f} years instead of {loan_term}")
 
-
-# Create a data-frame with the payment schedule.
-schedule = []
-remaining_balance = loan_amount
-
-for i in range(1, number_of_payments + 1):
-    interest_payment = remaining_balance * monthly_interest_rate
-    principal_payment = monthly_payment - interest_payment
-    remaining_balance -= principal_payment
-    year = math.ceil(i / 12)  # Calculate the year into the loan
-    schedule.append(
-        [
-            i,
-            monthly_payment,
-            principal_payment,
-            interest_payment,
-            remaining_balance,
-            year,
-        ]
-    )
-
-df = pd.DataFrame(
-    schedule,
-    columns=["Month", "Payment", "Principal", "Interest", "Remaining Balance", "Year"],
-)
-
-# Display the data-frame as a chart.
+# Display the yearly balance as a chart.
 st.write("### Payment Schedule")
-payments_df = df[["Year", "Remaining Balance"]].groupby("Year").min()
-st.line_chart(payments_df)
\ No newline at end of file
+payments_df = MG.yearly_rollup(schedule).set_index("Year")[["Remaining Balance"]]
+st.line_chart(payments_df)
+
+# Every rate / term combination for this home and deposit at once (see MG.scenario_grid)
+st.write("### Affordability Heatmap")
+grid = MG.scenario_grid(home_value, np.arange(1.0, 10.25, 0.25), np.arange(10, 41, 5), [deposit], curves=False)
+fig = px.imshow(MG.grid_table(grid, 'monthly_payment'), aspect='auto', origin='lower',
+                color_continuous_scale='RdYlGn_r', labels=dict(color="Monthly Repayment"))
+st.plotly_chart(fig, width="stretch")
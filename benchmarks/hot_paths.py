@@ -0,0 +1,286 @@
+# Benchmarks for the data loading and calculation hot paths
+# Everything runs offline: the checked in resources are copied into a temp folder first (so the real files and their
+# feather caches are never touched) and the Treasury's http session is swapped for a stub that serves the rows in
+# debt_backup.json as api pages and answers 304 Not Modified for the Tax Policy Center workbook.
+# Run them with run_benchmarks.py
+
+# imports
+import json
+import os
+import shutil
+import sys
+import tempfile
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+# the repo root, so the benchmarks import the same way the app does
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from AmericanRealityClasses import TreasuryApi as TA
+from AmericanRealityClasses.Tax_Calculator import tax_logic as TL
+from AmericanRealityClasses.Tax_Calculator.tax_engine import progressive_tax
+
+DEBT_BACKUP_SOURCE = os.path.join(REPO_ROOT, 'AmericanRealityClasses', 'resources', 'debt_backup.json')
+TAX_POLICY_SOURCE = os.path.join(REPO_ROOT, 'AmericanRealityClasses', 'resources', 'TaxPolicyCenterHistoricRevenues.xlsx')
+TAX_RESOURCES_SOURCE = os.path.join(REPO_ROOT, 'AmericanRealityClasses', 'Tax_Calculator', 'resources')
+TAX_BRACKET_WORKBOOK = 'tax_foundation_tax_rates.xlsx'
+DEBT_URL = TA.FiscalDataClient.datasetUrl(TA.DEBT_OUTSTANDING_DATASET)
+BENCHMARK_YEAR = 2024
+
+# name -> Benchmark, in the order they are defined
+BENCHMARKS = {}
+
+
+class Benchmark:
+    """
+    func(state) is what gets timed. setup() builds the state and is never timed:
+        fresh_setup=False - setup runs once and every call shares the state (warm caches)
+        fresh_setup=True  - setup runs before every single call (cold starts, one call per repeat)
+    number = calls per repeat
+    """
+
+    def __init__(self, name, func, setup=None, number=1, fresh_setup=False):
+        self.name = name
+        self.func = func
+        self.setup = setup if setup is not None else (lambda: None)
+        self.number = 1 if fresh_setup else number
+        self.fresh_setup = fresh_setup
+
+
+def benchmark(name, setup=None, number=1, fresh_setup=False):
+    def register(func):
+        BENCHMARKS[name] = Benchmark(name, func, setup, number, fresh_setup)
+        return func
+    return register
+
+
+# --- offline http ---
+class StubResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = {}
+
+    def json(self):
+        return self.payload
+
+    def iter_content(self, chunk_size=1):
+        return iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class StubSession:
+    """
+    Stands in for requests.Session. Fiscal Data urls get pages of `records` (page[number], page[size] and
+    record_date:gt: filters are honored), anything else gets a 304
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        parts = urlsplit(url)
+        if not parts.path.startswith('/services/api/fiscal_service'):
+            return StubResponse(304)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        rows = self.records
+        for condition in filter(None, query.get('filter', '').split(',')):
+            column, operator, value = condition.split(':', 2)
+            if operator == 'gt':
+                rows = [row for row in rows if row[column] > value]
+        page_number, page_size = int(query.get('page[number]', 1)), int(query.get('page[size]', 100))
+        total_pages = max(1, -(-len(rows) // page_size))
+        page = rows[(page_number - 1) * page_size:page_number * page_size]
+        return StubResponse(200, {'data': page, 'meta': {'total-pages': total_pages, 'total-count': len(rows)}})
+
+
+def debt_records():
+    with open(DEBT_BACKUP_SOURCE, 'r') as f:
+        return json.load(f)['data']
+
+
+def offline_treasury():
+    treasury = TA.Treasury()
+    treasury.session = StubSession(debt_records())
+    return treasury
+
+
+_workspaces = []
+
+
+def workspace():
+    """
+    Empty temp folder (removed when the process exits)
+    """
+    path = tempfile.mkdtemp(prefix='usa_cash_flows_bench_')
+    _workspaces.append(path)
+    return path
+
+
+def cleanup_workspaces():
+    while _workspaces:
+        shutil.rmtree(_workspaces.pop(), ignore_errors=True)
+
+
+def copy_tax_resources(with_caches):
+    """
+    Copy of the Tax_Calculator resources - with_caches=False leaves the compiled feather tables behind
+    """
+    folder = workspace()
+    for name in os.listdir(TAX_RESOURCES_SOURCE):
+        if with_caches or not name.endswith('.feather'):
+            shutil.copy(os.path.join(TAX_RESOURCES_SOURCE, name), folder)
+    return os.path.join(folder, TAX_BRACKET_WORKBOOK)
+
+
+def warm_tax_manager():
+    manager = TL.TaxDataManager(copy_tax_resources(with_caches=True))
+    manager.get_annual_rate_extremes()
+    return manager
+
+
+# --- Treasury debt api ---
+def debt_full_crawl_setup():
+    return offline_treasury(), os.path.join(workspace(), 'debt_backup.json')
+
+
+@benchmark('treasury.debt_api_full_crawl', setup=debt_full_crawl_setup, fresh_setup=True)
+def debt_api_full_crawl(state):
+    # no backup yet: every page from the (stub) api, json backup written, cleaned, feather cache written
+    treasury, storage_path = state
+    treasury.getHistoricalDebtAPIData(DEBT_URL, storage_path=storage_path)
+
+
+def debt_incremental_setup():
+    treasury, storage_path = debt_full_crawl_setup()
+    shutil.copy(DEBT_BACKUP_SOURCE, storage_path)
+    treasury.loadDebtFrame(storage_path)
+    return treasury, storage_path
+
+
+@benchmark('treasury.debt_api_incremental_refresh', setup=debt_incremental_setup, number=20)
+def debt_api_incremental_refresh(state):
+    # routine refresh: one request for rows past the last record_date (none), frame from the feather cache
+    treasury, storage_path = state
+    treasury.getHistoricalDebtAPIData(DEBT_URL, incremental=True, storage_path=storage_path)
+
+
+# --- debt frame: json backup vs feather cache ---
+@benchmark('treasury.debt_load_json', setup=debt_incremental_setup, number=20)
+def debt_load_json(state):
+    # what every load cost before the cache: json.load the backup + cast the string rows
+    treasury, storage_path = state
+    treasury.cleanDebtData(treasury.loadDebtBackup(storage_path))
+
+
+@benchmark('treasury.debt_load_feather', setup=debt_incremental_setup, number=20)
+def debt_load_feather(state):
+    # cache hit: hash the json, memory-map the feather file
+    treasury, storage_path = state
+    treasury.loadDebtFrame(storage_path)
+
+
+# --- Tax Policy Center workbook ---
+@benchmark('treasury.tax_policy_parse_workbook', number=3)
+def tax_policy_parse_workbook(state):
+    # the openpyxl parse + clean a cache miss pays
+    TA.Treasury.parseTaxPolicyWorkbook(TAX_POLICY_SOURCE)
+
+
+def tax_policy_download_setup():
+    save_location = os.path.join(workspace(), 'TaxPolicyCenterHistoricRevenues.xlsx')
+    shutil.copy(TAX_POLICY_SOURCE, save_location)
+    treasury = offline_treasury()
+    treasury.getTaxPolicyDownload(save_location)
+    return treasury, save_location
+
+
+@benchmark('treasury.tax_policy_download_not_modified', setup=tax_policy_download_setup, number=20)
+def tax_policy_download_not_modified(state):
+    # routine check: 304 from the (stub) server, frame from the feather cache. Calls the two steps directly -
+    # getTaxPolicyDownload would skip the request since the setup call just checked
+    treasury, save_location = state
+    treasury.downloadIfChanged(TA.TAX_POLICY_URL, save_location)
+    treasury.loadTaxPolicyFrame(save_location)
+
+
+# --- TaxDataManager ---
+@benchmark('tax.manager_init_cold', setup=lambda: copy_tax_resources(with_caches=False), fresh_setup=True)
+def tax_manager_init_cold(income_bracket_file):
+    # first start after the workbook changed: read the sheet, compile and save the bracket table
+    TL.TaxDataManager(income_bracket_file)
+
+
+@benchmark('tax.manager_init_warm', setup=lambda: copy_tax_resources(with_caches=True), number=20)
+def tax_manager_init_warm(income_bracket_file):
+    TL.TaxDataManager(income_bracket_file)
+
+
+@benchmark('tax.get_clean_income_tax_data', setup=warm_tax_manager, number=1000)
+def get_clean_income_tax_data(manager):
+    manager.get_clean_income_tax_data(BENCHMARK_YEAR, 'single')
+
+
+@benchmark('tax.get_annual_rate_extremes', setup=warm_tax_manager, number=1000)
+def get_annual_rate_extremes(manager):
+    manager.get_annual_rate_extremes('single')
+
+
+@benchmark('tax.get_standard_deduction', setup=warm_tax_manager, number=5000)
+def get_standard_deduction(manager):
+    # per call cost - the json table is loaded once per process, this is a dict lookup
+    manager.get_standard_deduction(BENCHMARK_YEAR, 'single')
+
+
+@benchmark('tax.get_personal_exemption', setup=warm_tax_manager, number=5000)
+def get_personal_exemption(manager):
+    manager.get_personal_exemption(1990, 'single', dependents=2)
+
+
+def forget_json_tables():
+    TL._json_tables.clear()
+    return TL.TaxDataManager(copy_tax_resources(with_caches=True))
+
+
+@benchmark('tax.json_tables_first_load', setup=forget_json_tables, fresh_setup=True)
+def json_tables_first_load(manager):
+    # the one time parse the lookups above no longer pay on every call
+    manager.get_standard_deduction(BENCHMARK_YEAR, 'single')
+    manager.get_personal_exemption(1990, 'single')
+
+
+@benchmark('tax.compile_rate_extremes', setup=warm_tax_manager, number=50)
+def compile_rate_extremes(manager):
+    TL.TaxDataManager.compile_rate_extremes(manager.bracket_table)
+
+
+# --- Tax_Calculator bucket math ---
+def bracket_setup(incomes):
+    manager = warm_tax_manager()
+    rate, low, high = manager.get_brackets(BENCHMARK_YEAR, 'single')
+    return incomes, low, high, rate
+
+
+@benchmark('tax.bucket_math_one_income', setup=lambda: bracket_setup(85000.0), number=5000)
+def bucket_math_one_income(state):
+    progressive_tax(*state)
+
+
+@benchmark('tax.bucket_math_100k_incomes',
+           setup=lambda: bracket_setup(np.random.default_rng(0).lognormal(11, 0.8, 100000)), number=20)
+def bucket_math_100k_incomes(state):
+    progressive_tax(*state)
+
+
+@benchmark('tax.tax_across_years', setup=warm_tax_manager, number=200)
+def tax_across_years(manager):
+    # the same income in every year of the data (1862 - now)
+    manager.get_tax_across_years(85000.0, 'single', dependents=2)
@@ -0,0 +1,135 @@
+# Times the hot path benchmarks in hot_paths.py (offline, no extra packages - just time.perf_counter)
+#     python benchmarks/run_benchmarks.py                          -> print the timings
+#     python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+#     python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+#     python benchmarks/run_benchmarks.py --filter tax.             -> only names containing 'tax.'
+# --compare prints new / baseline for every benchmark and exits with 1 if any got slower than --threshold.
+# Timings depend on the machine - save a baseline on the machine you compare on.
+
+# imports
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import hot_paths
+
+DEFAULT_REPEAT = 5
+# new best time / baseline best time above this counts as a regression
+DEFAULT_THRESHOLD = 1.3
+
+
+def time_benchmark(bench, repeat=DEFAULT_REPEAT):
+    """
+    Seconds per call for every repeat (setup never counted). The app's print() chatter is swallowed.
+    """
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        state = None if bench.fresh_setup else bench.setup()
+        # one untimed call so imports / first-use caches are not in the numbers
+        bench.func(bench.setup() if bench.fresh_setup else state)
+        for _ in range(repeat):
+            if bench.fresh_setup:
+                state = bench.setup()
+            start = time.perf_counter()
+            for _ in range(bench.number):
+                bench.func(state)
+            timings.append((time.perf_counter() - start) / bench.number)
+    return timings
+
+
+def run(names, repeat=DEFAULT_REPEAT):
+    results = {}
+    try:
+        for name in names:
+            bench = hot_paths.BENCHMARKS[name]
+            timings = time_benchmark(bench, repeat)
+            results[name] = {'best': min(timings), 'median': statistics.median(timings),
+                             'number': bench.number, 'repeat': repeat}
+            print(f"{name:<45} {format_seconds(min(timings)):>10} best  "
+                  f"{format_seconds(statistics.median(timings)):>10} median")
+    finally:
+        hot_paths.cleanup_workspaces()
+    return results
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def environment():
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Prints new / baseline best times. Returns the names that got slower than threshold
+    """
+    regressions = []
+    print(f"\nvs baseline from {baseline.get('environment', {}).get('created', '?')}:")
+    for name, result in results.items():
+        old = baseline.get('results', {}).get(name)
+        if old is None:
+            print(f"{name:<45} (not in the baseline)")
+            continue
+        ratio = result['best'] / old['best']
+        flag = ''
+        if ratio > threshold:
+            flag = '  <-- SLOWER'
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        print(f"{name:<45} {format_seconds(old['best']):>10} -> {format_seconds(result['best']):>10}  "
+              f"x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the data loading and tax math hot paths")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--save', help="write the results to this json file (ex: a new baseline)")
+    parser.add_argument('--compare', help="baseline json to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    names = [name for name in hot_paths.BENCHMARKS if args.filter in name]
+    results = run(names, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,7 @@ from os import write
 import streamlit as st
 import os
 import sys
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
@@ -25,12 +26,13 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 # bring in our classes - setup to help streamlit failures
 try:
-    from AmericanRealityClasses.Tax_Calculator.tax_logic import TaxDataManager
+    from AmericanRealityClasses.data_service import get_data_service
+    from AmericanRealityClasses.Tax_Calculator.tax_engine import progressive_tax
 except ImportError as e:
     st.error(f"Could not find tax_logic.py. Error: {e}")
 
-# instance creation
-tax_manager = TaxDataManager()
+# one TaxDataManager for the whole app (shared with the dashboard) instead of one per rerun
+tax_manager = get_data_service().tax_manager
 
 # marriage mapping for JSON dict key files
 status_options = {
@@ -169,16 +171,10 @@ with st.container(border=True):
     tab1, tab2 = st.tabs(["🧮 TAX CALCULATOR", "📖 FAQ & SOURCES"])
 
     with tab1:
-        # 1. Logic calls:
-        income_tax_bracket = tax_manager.get_clean_income_tax_data(year=tax_year, status=marriage_status)
+        # 1. Logic calls: bracket arrays (Rate, Low, High) for the year and status
+        bracket_rates, bracket_lows, bracket_highs = tax_manager.get_brackets(year=tax_year, status=marriage_status)
         standard_deduction_amount = tax_manager.get_standard_deduction(year=tax_year, status=marriage_status)
 
-        # 2. Find the names of columns (Low, High, Rate)
-        cols = income_tax_bracket.columns.tolist()
-        low_col = next((c for c in cols if any(x in c.lower() for x in ['low', 'min', 'start'])), None)
-        high_col = next((c for c in cols if any(x in c.lower() for x in ['high', 'max', 'end', 'upper'])), None)
-        rate_col = next((c for c in cols if any(x in c.lower() for x in ['rate', 'tax', 'perc'])), None)
-
         # 3. Handle Personal Exemptions (Historical Logic)
         if 1913 <= tax_year <= 2017:
             personal_exemption, dependents_rate, note = tax_manager.get_personal_exemption(year=tax_year,
@@ -207,9 +203,9 @@ with st.container(border=True):
                   help="This is the 'Bucket' money. Only this portion is subject to tax rates.")
 
         # --- NEW: TAX RATE RANGE ---
-        if not income_tax_bracket.empty and rate_col:
-            min_rate = income_tax_bracket[rate_col].min() * 100
-            max_rate = income_tax_bracket[rate_col].max() * 100
+        if len(bracket_rates):
+            min_rate = np.nanmin(bracket_rates) * 100
+            max_rate = np.nanmax(bracket_rates) * 100
 
             c4, c5 = st.columns(2)
             c4.metric(f"Lowest Rate ({tax_year})", f"{min_rate:,.1f}%",
@@ -218,31 +214,19 @@ with st.container(border=True):
                       help="The top marginal rate for this year.")
 
         # 6. THE PROGRESSIVE "BUCKET" CALCULATION
-        remaining_taxable = taxable_income
-        total_progressive_tax = 0
-        buckets = []
-
-        # Logic to iterate through brackets and fill the buckets
-        for i, row in income_tax_bracket.iterrows():
-            lower = row[low_col]
-            upper = row[high_col] if (high_col and not pd.isna(row[high_col])) else 1e15
-            rate = row[rate_col]
-
-            bracket_width = upper - lower
-
-            if remaining_taxable > 0:
-                amount_in_bracket = min(remaining_taxable, bracket_width)
-                tax_for_bracket = amount_in_bracket * rate
-                total_progressive_tax += tax_for_bracket
-                remaining_taxable -= amount_in_bracket
-
-                buckets.append({
-                    "Bracket": f"{rate * 100:.1f}%",
-                    "Amount": amount_in_bracket,
-                    "Tax": tax_for_bracket
-                })
-
-        effective_rate = (total_progressive_tax / gross_income) * 100 if gross_income > 0 else 0
+        # fill the buckets from the lowest bracket up (tax_engine does it with arrays)
+        bucket_math = progressive_tax(taxable_income, bracket_lows, bracket_highs, bracket_rates,
+                                      gross_income=gross_income)
+        total_progressive_tax = bucket_math['total']
+        effective_rate = bucket_math['effective_rate']
+
+        # only the buckets that actually got money go on the chart
+        filled = bucket_math['amounts'] > 0
+        buckets = pd.DataFrame({
+            "Bracket": [f"{rate * 100:.1f}%" for rate in bracket_rates[filled]],
+            "Amount": bucket_math['amounts'][filled],
+            "Tax": bucket_math['taxes'][filled]
+        })
 
         # 7. THE REGRESSIVE (FLAT) COMPARISON
         flat_rate = 0.20
@@ -252,9 +236,9 @@ with st.container(border=True):
         st.subheader("🪣 The 'Bucket' Breakdown (Progressive)")
 
         # 8. Create the visual Chart
-        if buckets:
-            df_buckets = pd.DataFrame(buckets)
-            bar_labels = [f"${row['Amount']:,.0f}<br>Tax: ${row['Tax']:,.0f}" for _, row in df_buckets.iterrows()]
+        if not buckets.empty:
+            df_buckets = buckets
+            bar_labels = [f"${amount:,.0f}<br>Tax: ${tax:,.0f}" for amount, tax in zip(df_buckets["Amount"], df_buckets["Tax"])]
 
             fig_buckets = go.Figure()
             fig_buckets.add_trace(go.Bar(
@@ -318,6 +302,31 @@ with st.container(border=True):
         take_home = gross_income - total_progressive_tax
         st.metric("💰 Your Annual Take-Home Pay", f"${take_home:,.2f}")
 
+        # 11. SAME INCOME, EVERY YEAR
+        st.divider()
+        st.subheader("📈 Your Income Across Every Tax Year")
+        st.caption("The same income, filing status and dependents run through every year's brackets and deductions.")
+
+        all_years = tax_manager.get_tax_across_years(gross_income, status=marriage_status,
+                                                     dependents=number_of_dependents)
+        fig_years = go.Figure()
+        fig_years.add_trace(go.Scatter(
+            x=all_years['Year'],
+            y=all_years['Effective_Rate'],
+            customdata=all_years[['Total_Tax', 'Take_Home']].to_numpy(),
+            line=dict(color='#FFD700', width=3),
+            hovertemplate=("<b>%{x}</b><br>Effective Rate: %{y:.2f}%<br>"
+                           "Total Tax: $%{customdata[0]:,.0f}<br>Take-Home: $%{customdata[1]:,.0f}<extra></extra>")
+        ))
+        fig_years.add_vline(x=tax_year, line=dict(color='#FF4B4B', dash='dot'))
+        fig_years.update_layout(
+            template="plotly_dark",
+            yaxis_title="Effective Tax Rate (%)",
+            xaxis_title="Tax Year",
+            height=450
+        )
+        st.plotly_chart(fig_years, width="stretch")
+
     with tab2:
         st.header("Frequently Asked Questions & Data Sources")
 
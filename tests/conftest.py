@@ -0,0 +1,25 @@
+# shared pytest setup
+#     python -m pytest -q        (from the repo root)
+
+# imports
+import os
+import sys
+
+import pytest
+
+# the repo root, so the tests import the same way the app does
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from http_stub import StubServer
+
+
+@pytest.fixture
+def stub_server():
+    """
+    A running StubServer on a free localhost port, shut down after the test
+    """
+    server = StubServer().start()
+    yield server
+    server.stop()
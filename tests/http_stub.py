@@ -0,0 +1,99 @@
+# A stub http server for the tests (no internet, no extra packages)
+# A stdlib http.server runs on a free localhost port in a background thread. Each test sets up the routes it needs
+# (status codes, delays, ETags ...) and then points the real Treasury / FiscalDataClient / LedgerClient code at it.
+
+# imports
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+class StubResponse:
+    def __init__(self, status=200, body=b'', headers=None, delay=0.0):
+        self.status = status
+        self.body = body.encode() if isinstance(body, str) else body
+        self.headers = headers or {}
+        self.delay = delay
+
+
+def json_response(payload, status=200, delay=0.0):
+    return StubResponse(status, json.dumps(payload), {'Content-Type': 'application/json'}, delay)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        request = {'path': parts.path, 'query': parse_qs(parts.query), 'headers': dict(self.headers),
+                   'time': time.perf_counter()}
+        with server.lock:
+            server.requests.append(request)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            route = server.routes.get(parts.path)
+            response = route(request) if route is not None else StubResponse(404, 'no route')
+            time.sleep(response.delay)
+            self.send_response(response.status)
+            for key, value in response.headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(response.body)))
+            self.end_headers()
+            self.wfile.write(response.body)
+        except ConnectionError:
+            # the client gave up first (timeout tests) - nothing left to answer
+            pass
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        # keep the test output readable
+        pass
+
+
+class StubServer:
+    """
+    routes: path -> function(request) returning a StubResponse. requests keeps every request that came in
+    (path, parsed query, headers, arrival time) and max_in_flight the most requests it was answering at once
+    """
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = {}
+        self.httpd.requests = []
+        self.httpd.lock = threading.Lock()
+        self.httpd.in_flight = 0
+        self.httpd.max_in_flight = 0
+        self.thread = None
+
+    @property
+    def routes(self):
+        return self.httpd.routes
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def max_in_flight(self):
+        return self.httpd.max_in_flight
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                                       name='stub-http', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        # safe to call twice - a test can take the server down before the fixture does
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.thread = None
@@ -0,0 +1,87 @@
+# FiscalDataService: local snapshot first, the background refresher swaps in new ones
+
+# imports
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from AmericanRealityClasses import data_service as DS
+
+RESOURCES = os.path.join(os.path.dirname(DS.__file__), 'resources')
+
+
+class OfflineService(DS.FiscalDataService):
+    """
+    fetch_snapshot without the network - rebuilds from the files on disk (flagged 'API'),
+    or raises when fail is set. Every fetch is counted
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail = False
+        self.fetches = 0
+        self.fetched = threading.Event()
+
+    def fetch_snapshot(self):
+        self.fetches += 1
+        try:
+            if self.fail:
+                raise ConnectionError('api down')
+            return self.build_snapshot(self.treasury.loadDebtFrame(self.debt_backup_file),
+                                       self.treasury.loadTaxPolicyFrame(self.tax_policy_file), 'API')
+        finally:
+            self.fetched.set()
+
+
+@pytest.fixture
+def service(tmp_path):
+    # copies so the feather caches get written in tmp_path, not next to the checked in files
+    for name in ['debt_backup.json', 'TaxPolicyCenterHistoricRevenues.xlsx']:
+        shutil.copy(os.path.join(RESOURCES, name), tmp_path)
+    service = OfflineService(debt_backup_file=str(tmp_path / 'debt_backup.json'),
+                             tax_policy_file=str(tmp_path / 'TaxPolicyCenterHistoricRevenues.xlsx'),
+                             spending_backup_file=str(tmp_path / 'mts_outlays_backup.json'),
+                             refresh_seconds=60)
+    yield service
+    service.stop_refresher(timeout=10)
+
+
+def wait_for(condition, seconds=10):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_local_snapshot_then_refreshed(service):
+    local = service.snapshot()
+    assert local.data_flag == 'Local'
+    assert not local.fiscal_facts.empty and local.spending_cube is None
+
+    wait_for(lambda: service.snapshot().data_flag == 'API')
+    assert service.snapshot().fiscal_facts.equals(local.fiscal_facts)
+
+    # stopping wakes the refresher out of its 60 s wait
+    service.stop_refresher(timeout=5)
+    assert not service._refresher.is_alive()
+    assert service.fetches == 1
+
+
+def test_failed_refresh_keeps_the_last_snapshot(service):
+    service.fail = True
+    local = service.snapshot()
+    wait_for(service.fetched.is_set)
+    service.stop_refresher(timeout=5)
+    assert service.snapshot() is local
+    assert service.refresh() is False and service.snapshot() is local
+
+
+def test_views_are_copies(service):
+    service.fail = True
+    snapshot = service.snapshot()
+    fiscal_facts, *_ = snapshot.views()
+    fiscal_facts.loc[fiscal_facts.index[0], 'Debt'] = -1.0
+    assert snapshot.fiscal_facts['Debt'].iloc[0] != -1.0
@@ -0,0 +1,179 @@
+# FiscalIndex / build_leaderboard on a small hand made fact table
+
+# imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from AmericanRealityClasses import fiscal_index as FI
+
+# debt for 1900-1910, deficits only for 1903-1908 (like the real data: debt from 1790, deficits from 1934)
+DATA_YEARS = np.arange(1900, 1911)
+DEFICIT_YEARS = (1903, 1908)
+
+
+def make_facts():
+    debt = 1000.0 + 10.0 * (DATA_YEARS - 1900) ** 2
+    deficit = np.where((DATA_YEARS >= DEFICIT_YEARS[0]) & (DATA_YEARS <= DEFICIT_YEARS[1]),
+                       -(DATA_YEARS - 1900) * 5.0, np.nan)
+    facts = pd.DataFrame({
+        'Debt': debt,
+        'Deficit': deficit,
+        'Surplus': deficit > 0,
+        'Def_Label': np.where(deficit > 0, 'Surplus', 'Deficit'),
+        'Low_Tax': 10.0 - (DATA_YEARS - 1900) * 0.5,
+        'High_Tax': 50.0 + (DATA_YEARS - 1900)
+    }, index=pd.Index(DATA_YEARS, name='Year'))
+    return facts[FI.FACT_COLUMNS]
+
+
+@pytest.fixture
+def facts():
+    return make_facts()
+
+
+@pytest.fixture
+def fiscal_idx(facts):
+    return FI.FiscalIndex(facts)
+
+
+def test_leaderboard_unknown_terms_are_blank(facts, fiscal_idx):
+    presidents = pd.DataFrame({
+        'name': ['Before The Data', 'Partly Known', 'Fully Known', 'Current Term'],
+        'party': ['A', 'B', 'A', 'B'],
+        'start_year': [1890, 1901, 1903, 1910],
+        'end_year': [1894, 1905, 1906, 1914]
+    })
+    board = FI.build_leaderboard(presidents, fiscal_idx).set_index('President')
+
+    # nothing known before the data starts - every number blank, not 0
+    assert board.loc['Before The Data', ['Debt Change', 'Term Deficit', 'Net Fiscal Impact']].isna().all()
+
+    # debt at both ends is known but 1901-1902 have no deficit - a 3 year sum would pass for a 5 year one
+    partly = board.loc['Partly Known']
+    assert partly['Debt Change'] == facts.loc[1905, 'Debt'] - facts.loc[1901, 'Debt']
+    assert np.isnan(partly['Term Deficit'])
+
+    fully = board.loc['Fully Known']
+    assert fully['Term Deficit'] == facts.loc[1903:1906, 'Deficit'].sum()
+    assert fully['Debt Change'] == facts.loc[1906, 'Debt'] - facts.loc[1903, 'Debt']
+    assert (fully['Min Tax'], fully['Max Tax']) == (facts.loc[1903:1906, 'Low_Tax'].min(),
+                                                    facts.loc[1903:1906, 'High_Tax'].max())
+
+    # the term still running - no end year debt and no deficits yet
+    current = board.loc['Current Term']
+    assert np.isnan(current['Debt Change']) and np.isnan(current['Term Deficit'])
+    assert (current['Min Tax'], current['Max Tax']) == (facts.loc[1910, 'Low_Tax'], facts.loc[1910, 'High_Tax'])
+
+
+def test_cumulative_deficit_needs_every_year(fiscal_idx):
+    metrics = fiscal_idx.range_metrics_batch([1903, 1902, 1907, 1880], [1908, 1904, 1909, 1885], missing=0.0)
+    assert metrics['deficit_complete'].tolist() == [True, False, False, False]
+    # `missing` for the incomplete ranges, whatever it is
+    assert metrics['cumulative_deficit'].tolist()[1:] == [0.0, 0.0, 0.0]
+    single = fiscal_idx.range_metrics(1902, 1904, missing=np.nan)
+    assert not single['deficit_complete'] and np.isnan(single['cumulative_deficit'])
+
+
+def test_empty_fact_table():
+    empty_idx = FI.FiscalIndex(FI.build_fact_table(pd.DataFrame(), pd.DataFrame(), pd.DataFrame()))
+    presidents = pd.DataFrame({'name': ['A'], 'party': ['B'], 'start_year': [2001], 'end_year': [2005]})
+    board = FI.build_leaderboard(presidents, empty_idx)
+    assert board[['Debt Change', 'Term Deficit', 'Net Fiscal Impact', 'Min Tax', 'Max Tax']].isna().all(axis=None)
+
+
+# --- prefix sum range queries vs plain pandas ---
+def gappy_facts(seed=11):
+    """
+    60 years with some years missing altogether and some missing just their deficit or tax rates
+    """
+    rng = np.random.default_rng(seed)
+    years = np.setdiff1d(np.arange(1900, 1960), rng.choice(np.arange(1901, 1959), 6, replace=False))
+    deficit = rng.normal(-50, 40, len(years)).round(1)
+    deficit[rng.choice(len(years), 5, replace=False)] = np.nan
+    low_tax = rng.uniform(1, 20, len(years)).round(1)
+    low_tax[rng.choice(len(years), 4, replace=False)] = np.nan
+    facts = pd.DataFrame({
+        'Debt': np.cumsum(rng.uniform(10, 100, len(years))).round(1),
+        'Deficit': deficit,
+        'Surplus': deficit > 0,
+        'Def_Label': np.where(deficit > 0, 'Surplus', 'Deficit'),
+        'Low_Tax': low_tax,
+        'High_Tax': low_tax + 30
+    }, index=pd.Index(years, name='Year'))
+    return facts[FI.FACT_COLUMNS]
+
+
+def pandas_metrics(facts, start_year, end_year, missing):
+    """
+    The range metrics the way the dashboard used to work them out - lookups and sums on the frame
+    """
+    def value(year, column):
+        # `missing` is only for years not in the table - a year that is there keeps its own (maybe nan) value
+        return facts.loc[year, column] if year in facts.index else missing
+
+    window = facts.loc[start_year:end_year, 'Deficit']
+    complete = window.notna().sum() == end_year - start_year + 1
+    beginning_debt, ending_debt = value(start_year, 'Debt'), value(end_year, 'Debt')
+    beginning_deficit, ending_deficit = value(start_year, 'Deficit'), value(end_year, 'Deficit')
+    term_length = end_year - start_year
+    return {
+        'beginning_debt': beginning_debt,
+        'ending_debt': ending_debt,
+        'total_debt_change': ending_debt - beginning_debt,
+        'beginning_deficit': beginning_deficit,
+        'ending_deficit': ending_deficit,
+        'deficit_growth': ending_deficit - beginning_deficit,
+        'cumulative_deficit': window.sum() if complete else missing,
+        'term_length': term_length,
+        'hypothetical_total_deficit': beginning_deficit * term_length,
+        'hypothetical_ending_debt': beginning_debt - beginning_deficit * term_length,
+        'responsibility_gap': ending_debt - (beginning_debt - beginning_deficit * term_length),
+        'found': start_year in facts.index and end_year in facts.index,
+        'deficit_complete': complete
+    }
+
+
+def random_ranges(count=300, seed=5):
+    # some ranges hang off either end of the data, some are a single year
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(1890, 1965, count)
+    return starts, starts + rng.integers(0, 15, count)
+
+
+@pytest.mark.parametrize('missing', [0.0, np.nan])
+def test_range_metrics_match_pandas(missing):
+    facts = gappy_facts()
+    fiscal_idx = FI.FiscalIndex(facts)
+    starts, ends = random_ranges()
+    batch = fiscal_idx.range_metrics_batch(starts, ends, missing=missing)
+    for i, (start_year, end_year) in enumerate(zip(starts.tolist(), ends.tolist())):
+        expected = pandas_metrics(facts, start_year, end_year, missing)
+        single = fiscal_idx.range_metrics(start_year, end_year, missing=missing)
+        for name, value in expected.items():
+            assert batch[name][i] == pytest.approx(value, nan_ok=True), (start_year, end_year, name)
+            assert single[name] == pytest.approx(value, nan_ok=True), (start_year, end_year, name)
+
+
+def test_tax_range_matches_pandas():
+    facts = gappy_facts()
+    starts, ends = random_ranges()
+    lowest, highest = FI.FiscalIndex(facts).tax_range_batch(starts, ends)
+    for i, (start_year, end_year) in enumerate(zip(starts.tolist(), ends.tolist())):
+        window = facts.loc[start_year:end_year]
+        assert lowest[i] == pytest.approx(window['Low_Tax'].min(), nan_ok=True), (start_year, end_year)
+        assert highest[i] == pytest.approx(window['High_Tax'].max(), nan_ok=True), (start_year, end_year)
+
+
+def test_row_of_and_fact_range():
+    facts = gappy_facts()
+    fiscal_idx = FI.FiscalIndex(facts)
+    years = np.arange(1880, 1975)
+    expected = [facts.index.get_loc(year) if year in facts.index else -1 for year in years]
+    assert fiscal_idx.row_of(years).tolist() == expected
+    pd.testing.assert_frame_equal(FI.fact_range(facts, 1905, 1921), facts.loc[1905:1921].reset_index())
+
+
+def test_index_is_read_only(fiscal_idx):
+    with pytest.raises(ValueError):
+        fiscal_idx.cumulative_deficit[0] = 1.0
@@ -0,0 +1,103 @@
+# LedgerAggregator running totals vs adding the whole sheet up again
+
+# imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from AmericanRealityClasses.ledger_aggregate import LedgerAggregator
+
+
+def sheet(rows):
+    return pd.DataFrame(rows, columns=['Date', 'Donor', 'Amount'])
+
+
+def from_scratch(df):
+    """
+    (total, monthly dict) the slow way - what the running totals have to match
+    """
+    amounts = pd.to_numeric(df['Amount'])
+    months = pd.to_datetime(df['Date'], errors='coerce').dt.strftime('%Y-%m')
+    return float(amounts.sum()), {month: float(amount) for month, amount in amounts.groupby(months).sum().items()}
+
+
+def assert_matches(aggregator, df):
+    total, monthly = from_scratch(df)
+    assert aggregator.total == pytest.approx(total)
+    assert aggregator.monthly.keys() == monthly.keys()
+    for month, amount in monthly.items():
+        assert aggregator.monthly[month] == pytest.approx(amount)
+
+
+ROWS = [('2026-01-05', 'A', 25.0), ('2026-01-20', 'B', 100.5), ('2026-02-10', 'C', 40.0), ('2026-03-01', 'D', 7.25)]
+
+
+def test_new_rows_are_folded_in():
+    aggregator = LedgerAggregator()
+    assert aggregator.update(sheet(ROWS[:2])) == 2
+    assert aggregator.update(sheet(ROWS[:2])) == 0
+    assert aggregator.update(sheet(ROWS)) == 2
+    assert aggregator.full_recomputes == 0
+    assert aggregator.row_count == 4
+    assert_matches(aggregator, sheet(ROWS))
+    assert aggregator.monthly_frame().to_dict('list') == {'Month': ['2026-01', '2026-02', '2026-03'],
+                                                          'Amount': [125.5, 40.0, 7.25]}
+
+
+@pytest.mark.parametrize('change', ['edit', 'delete', 'reorder', 'truncate'])
+def test_changed_earlier_rows_recount_everything(change):
+    aggregator = LedgerAggregator()
+    aggregator.update(sheet(ROWS))
+    rows = list(ROWS)
+    if change == 'edit':
+        rows[1] = ('2026-01-20', 'B', 99.5)
+    elif change == 'delete':
+        del rows[0]
+    elif change == 'reorder':
+        rows = rows[::-1]
+    else:
+        rows = rows[:2]
+    rows.append(('2026-04-02', 'E', 12.0))
+
+    assert aggregator.update(sheet(rows)) == len(rows)
+    assert aggregator.full_recomputes == 1
+    assert_matches(aggregator, sheet(rows))
+
+
+def test_amount_type_change_recounts():
+    aggregator = LedgerAggregator()
+    aggregator.update(sheet([('2026-01-05', 'A', 25), ('2026-01-06', 'B', 30)]))
+    # the sheet now has a cent amount, every Amount turns into a float
+    rows = [('2026-01-05', 'A', 25.0), ('2026-01-06', 'B', 30.0), ('2026-01-07', 'C', 0.5)]
+    aggregator.update(sheet(rows))
+    assert aggregator.full_recomputes == 1
+    assert_matches(aggregator, sheet(rows))
+
+
+def test_rows_without_a_date_count_in_the_total_only():
+    aggregator = LedgerAggregator()
+    df = sheet([('2026-01-05', 'A', 25.0), ('not a date', 'B', 10.0), (None, 'C', 5.0)])
+    aggregator.update(df)
+    assert aggregator.total == 40.0
+    assert aggregator.monthly == {'2026-01': 25.0}
+
+
+def test_random_edits_match_from_scratch():
+    rng = np.random.default_rng(22)
+    aggregator = LedgerAggregator()
+    rows = []
+    for step in range(200):
+        action = rng.choice(['append', 'append', 'append', 'edit', 'delete'])
+        if action == 'append' or not rows:
+            for _ in range(rng.integers(1, 4)):
+                rows.append((f"2025-{rng.integers(1, 13):02d}-{rng.integers(1, 29):02d}", f"donor {step}",
+                             float(rng.integers(1, 50000)) / 100))
+        elif action == 'edit':
+            i = rng.integers(len(rows))
+            rows[i] = (rows[i][0], rows[i][1], rows[i][2] + 1.0)
+        else:
+            del rows[rng.integers(len(rows))]
+        aggregator.update(sheet(rows))
+        assert_matches(aggregator, sheet(rows))
+    # most refreshes only added rows
+    assert 0 < aggregator.full_recomputes < 100
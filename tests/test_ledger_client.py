@@ -0,0 +1,97 @@
+# LedgerClient against the local stub server: both sheets at once and the last good copy
+
+# imports
+import os
+import time
+
+from AmericanRealityClasses import ledger_client as LC
+from http_stub import StubResponse
+
+DONATIONS_CSV = '"Date","Donor","Amount"\n"2026-01-05","A",25\n"2026-02-10","B",100.5\n'
+EXPENSES_CSV = '"Date ","Item","Amount"\n"2026-01-01","Hosting",12\n'
+
+
+def csv_route(text, delay=0.0):
+    return lambda request: StubResponse(200, text, {'Content-Type': 'text/csv'}, delay)
+
+
+def serve_ledger(server, donations=DONATIONS_CSV, expenses=EXPENSES_CSV):
+    server.routes['/Donations.csv'] = csv_route(donations)
+    server.routes['/Expenses.csv'] = csv_route(expenses)
+
+
+def ledger_client(server, folder, refresh_seconds=60, timeout=2):
+    urls = {sheet: server.url(f"/{sheet}.csv") for sheet in LC.LEDGER_SHEETS}
+    return LC.LedgerClient(urls, os.path.join(folder, 'ledger_snapshot.json'), refresh_seconds, timeout)
+
+
+def ledger_totals(snapshot):
+    return snapshot.total_donations, snapshot.total_expenses
+
+
+def test_sheets_fetched_at_once(stub_server, tmp_path):
+    stub_server.routes['/Donations.csv'] = csv_route(DONATIONS_CSV, delay=0.3)
+    stub_server.routes['/Expenses.csv'] = csv_route(EXPENSES_CSV, delay=0.3)
+    start = time.perf_counter()
+    snapshot = ledger_client(stub_server, tmp_path).fetch_snapshot()
+    # two 0.3s sheets side by side, not one after the other
+    assert time.perf_counter() - start < 0.55
+    assert stub_server.max_in_flight == 2
+    assert ledger_totals(snapshot) == (125.5, 12.0)
+
+
+def test_failed_refresh_keeps_last_good(stub_server, tmp_path):
+    serve_ledger(stub_server)
+    client = ledger_client(stub_server, tmp_path, timeout=0.5)
+    assert client.refresh()
+    assert os.path.exists(client.snapshot_file)
+    good = client.snapshot()
+
+    # one sheet down - the whole refresh fails, nothing half updated
+    stub_server.routes['/Expenses.csv'] = lambda request: StubResponse(500, 'down')
+    assert not client.refresh()
+    # a sheet with no Amount column is broken, not $0
+    stub_server.routes['/Expenses.csv'] = csv_route('"Date","Item"\n"2026-01-01","Hosting"\n')
+    assert not client.refresh()
+    # a sheet slower than the timeout
+    stub_server.routes['/Expenses.csv'] = csv_route(EXPENSES_CSV, delay=1.5)
+    start = time.perf_counter()
+    assert not client.refresh()
+    assert time.perf_counter() - start < 1.2
+
+    assert client.snapshot() is good
+    assert ledger_totals(good) == (125.5, 12.0)
+
+
+def test_server_down_serves_disk_copy(stub_server, tmp_path):
+    serve_ledger(stub_server)
+    assert ledger_client(stub_server, tmp_path).refresh()
+    stub_server.stop()
+
+    # a fresh process (new client) starts from the saved copy, already stale, with the server gone
+    client = ledger_client(stub_server, tmp_path, refresh_seconds=0, timeout=0.5)
+    start = time.perf_counter()
+    snapshot = client.snapshot()
+    assert time.perf_counter() - start < 0.2
+    assert snapshot.source == 'disk'
+    assert ledger_totals(snapshot) == (125.5, 12.0)
+    # the stale copy started a background refresh - it fails and the disk copy stays up
+    client._refresher.join(5)
+    assert client.snapshot().source == 'disk'
+
+
+def test_stale_copy_refreshed_in_background(stub_server, tmp_path):
+    serve_ledger(stub_server)
+    assert ledger_client(stub_server, tmp_path).refresh()
+
+    # a new donation shows up, the sheet is slow
+    stub_server.routes['/Donations.csv'] = csv_route(DONATIONS_CSV + '"2026-03-01","C",10\n', delay=0.5)
+    client = ledger_client(stub_server, tmp_path, refresh_seconds=0)
+    start = time.perf_counter()
+    snapshot = client.snapshot()
+    assert time.perf_counter() - start < 0.2
+    assert snapshot.source == 'disk'
+    client._refresher.join(5)
+    snapshot = client.snapshot()
+    assert snapshot.source == 'live'
+    assert ledger_totals(snapshot) == (135.5, 12.0)
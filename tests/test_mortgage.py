@@ -0,0 +1,118 @@
+# Mortgage math vs walking the loan one month at a time (the original calculator's loop)
+
+# imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from AmericanRealityClasses import mortgage as MG
+
+
+def walk_loan(loan_amount, interest_rate, loan_term, extra_payment=0.0):
+    """
+    The schedule the slow way: interest on the balance, the rest of the payment comes off it, stop when it is 0.
+    Returns a Month | Payment | Principal | Interest | Remaining Balance | Year frame
+    """
+    rate = interest_rate / 100 / 12
+    months = loan_term * 12
+    if rate == 0:
+        required = loan_amount / months
+    else:
+        required = loan_amount * rate * (1 + rate) ** months / ((1 + rate) ** months - 1)
+    extras = np.broadcast_to(np.asarray(extra_payment, dtype=float), (months,))
+    schedule = []
+    balance = loan_amount
+    for i in range(1, months + 1):
+        interest = balance * rate
+        payment = min(required + extras[i - 1], balance + interest)
+        balance -= payment - interest
+        if balance < MG.PAID_OFF_TOLERANCE:
+            balance = 0.0
+        schedule.append([i, payment, payment - interest, interest, balance, (i - 1) // 12 + 1])
+        if balance == 0:
+            break
+    return pd.DataFrame(schedule, columns=MG.SCHEDULE_COLUMNS)
+
+
+def assert_schedule_matches(schedule, expected):
+    frame = MG.schedule_frame(schedule)
+    assert len(frame) == len(expected)
+    assert frame['Month'].tolist() == expected['Month'].tolist()
+    assert frame['Year'].tolist() == expected['Year'].tolist()
+    for column in ['Payment', 'Principal', 'Interest', 'Remaining Balance']:
+        np.testing.assert_allclose(frame[column], expected[column], rtol=1e-9, atol=1e-6, err_msg=column)
+
+
+@pytest.mark.parametrize('interest_rate, loan_term', [(5.5, 30), (3.0, 15), (12.0, 10), (0.25, 5)])
+def test_amortize_matches_month_by_month(interest_rate, loan_term):
+    schedule = MG.amortize(400000, interest_rate, loan_term)
+    expected = walk_loan(400000, interest_rate, loan_term)
+    assert_schedule_matches(schedule, expected)
+    assert schedule['payoff_month'] == loan_term * 12
+    assert schedule['total_paid'] == pytest.approx(expected['Payment'].sum())
+    assert schedule['total_interest'] == pytest.approx(expected['Interest'].sum())
+
+
+def test_zero_rate():
+    schedule = MG.amortize(120000, 0.0, 10)
+    assert schedule['monthly_payment'] == 1000.0
+    assert (schedule['interest'] == 0).all()
+    assert schedule['total_paid'] == pytest.approx(120000)
+    assert_schedule_matches(schedule, walk_loan(120000, 0.0, 10))
+    # extra payments at 0% pay it off early too
+    early = MG.amortize(120000, 0.0, 10, extra_payment=1000.0)
+    assert early['payoff_month'] == 60
+    assert_schedule_matches(early, walk_loan(120000, 0.0, 10, extra_payment=1000.0))
+
+
+@pytest.mark.parametrize('interest_rate', [0.0, 6.5])
+def test_extra_monthly_payment(interest_rate):
+    schedule = MG.amortize(300000, interest_rate, 30, extra_payment=500.0)
+    expected = walk_loan(300000, interest_rate, 30, extra_payment=500.0)
+    assert_schedule_matches(schedule, expected)
+    assert schedule['payoff_month'] < 360
+    # the last payment only covers what was left
+    assert schedule['payment'][-1] < schedule['monthly_payment'] + 500.0
+    assert schedule['principal'].sum() == pytest.approx(300000)
+
+
+def test_lump_sum_extra_payment():
+    extra = np.zeros(360)
+    extra[23] = 50000.0
+    schedule = MG.amortize(300000, 6.5, 30, extra_payment=extra)
+    assert_schedule_matches(schedule, walk_loan(300000, 6.5, 30, extra_payment=extra))
+    assert schedule['payment'][23] == pytest.approx(schedule['monthly_payment'] + 50000.0)
+
+
+def test_deposit_bigger_than_home():
+    schedule = MG.amortize(-5000, 5.0, 30)
+    assert schedule['monthly_payment'] == 0.0
+    assert schedule['total_paid'] == 0.0
+
+
+def test_yearly_rollup_matches_groupby():
+    schedule = MG.amortize(250000, 4.75, 20, extra_payment=300.0)
+    frame = MG.schedule_frame(schedule)
+    expected = frame.groupby('Year').agg(Payment=('Payment', 'sum'), Principal=('Principal', 'sum'),
+                                         Interest=('Interest', 'sum'),
+                                         **{'Remaining Balance': ('Remaining Balance', 'last')}).reset_index()
+    pd.testing.assert_frame_equal(MG.yearly_rollup(schedule), expected, check_dtype=False)
+
+
+def test_scenario_grid_matches_amortize():
+    rates, terms, deposits = [0.0, 3.5, 7.25], [10, 15, 30], [0, 100000, 600000]
+    grid = MG.scenario_grid(500000, rates, terms, deposits, curve_step=6)
+    assert grid['balance_curves'].shape == (3, 3, 3, len(grid['curve_months']))
+    for i, rate in enumerate(rates):
+        for j, term in enumerate(terms):
+            for k, deposit in enumerate(deposits):
+                schedule = MG.amortize(500000 - deposit, rate, term)
+                assert grid['monthly_payment'][i, j, k] == pytest.approx(schedule['monthly_payment'])
+                assert grid['total_interest'][i, j, k] == pytest.approx(schedule['total_interest'], abs=1e-6)
+                # the payoff curve at the sampled months (0 once it is paid off)
+                balance = np.concatenate([[max(500000.0 - deposit, 0.0)], schedule['balance'],
+                                          np.zeros(grid['curve_months'][-1])])
+                np.testing.assert_allclose(grid['balance_curves'][i, j, k], balance[grid['curve_months']],
+                                           rtol=1e-9, atol=1e-5)
+    table = MG.grid_table(grid, 'monthly_payment', deposit_index=1)
+    assert table.shape == (3, 3) and table.loc[3.5, 15] == grid['monthly_payment'][1, 1, 1]
@@ -0,0 +1,329 @@
+# Treasury / FiscalDataClient against the local stub server: retries and backoff, parallel paging, the debt backup
+# sync and the conditional (304) workbook download
+
+# imports
+import os
+import time
+
+import pytest
+
+from AmericanRealityClasses import TreasuryApi as TA
+from http_stub import StubResponse, json_response
+
+TAX_POLICY_SOURCE = os.path.join(os.path.dirname(os.path.abspath(TA.__file__)), 'resources',
+                                 'TaxPolicyCenterHistoricRevenues.xlsx')
+
+# short backoff / timeout so the retry tests take milliseconds, not seconds
+TEST_BACKOFF = 0.05
+TEST_TIMEOUT = 0.3
+
+
+def stub_treasury(retries=3):
+    return TA.Treasury(max_workers=4, retries=retries, backoff=TEST_BACKOFF, timeout=TEST_TIMEOUT)
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# --- Treasury.getJson retry / backoff ---
+def flaky_route(failures, status=503, payload=None, delay=0.0):
+    """
+    Answers status (or, with a delay, nothing in time) for the first `failures` requests, then 200 with payload
+    """
+    calls = []
+
+    def route(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return StubResponse(status, 'try again', delay=delay)
+        return json_response(payload if payload is not None else {'data': [], 'meta': {'total-pages': 1}})
+    return route
+
+
+def test_retry_5xx_then_success(stub_server):
+    stub_server.routes['/flaky'] = flaky_route(2, status=503, payload={'ok': True})
+    treasury = stub_treasury()
+    assert treasury.getJson(stub_server.url('/flaky'), 'flaky') == {'ok': True}
+    times = [r['time'] for r in stub_server.requests]
+    assert len(times) == 3
+    # backoff doubles: ~1x then ~2x TEST_BACKOFF between the tries
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert gaps[0] >= TEST_BACKOFF * 0.9 and gaps[1] >= TEST_BACKOFF * 2 * 0.9, gaps
+    # a request that worked in the end is not an error
+    assert not treasury.ErrorLog
+
+
+def test_retry_429(stub_server):
+    stub_server.routes['/busy'] = flaky_route(1, status=429, payload={'ok': True})
+    assert stub_treasury().getJson(stub_server.url('/busy'), 'busy') == {'ok': True}
+    assert len(stub_server.requests) == 2
+
+
+def test_no_retry_on_4xx(stub_server):
+    treasury = stub_treasury()
+    with pytest.raises(ConnectionError, match='404'):
+        treasury.getJson(stub_server.url('/missing'), 'missing')
+    assert len(stub_server.requests) == 1
+    assert len(treasury.ErrorLog) == 1
+
+
+def test_retries_run_out(stub_server):
+    stub_server.routes['/down'] = lambda request: StubResponse(500, 'down')
+    with pytest.raises(ConnectionError, match='500 on page 7'):
+        stub_treasury(retries=2).getJson(stub_server.url('/down'), 'page 7')
+    # 1 try + 2 retries
+    assert len(stub_server.requests) == 3
+
+
+def test_retry_timeout(stub_server):
+    # the first answer takes longer than the timeout, the retry is instant
+    stub_server.routes['/slow'] = flaky_route(1, status=200, payload={'ok': True}, delay=TEST_TIMEOUT * 3)
+    start = time.perf_counter()
+    assert stub_treasury().getJson(stub_server.url('/slow'), 'slow') == {'ok': True}
+    assert time.perf_counter() - start < TEST_TIMEOUT * 3
+    assert len(stub_server.requests) == 2
+
+
+# --- paging ---
+def paged_route(rows, delay_for=None):
+    """
+    Fiscal Data style pages of rows (page[number] / page[size] query, meta total-pages).
+    delay_for(page_number, total_pages) -> seconds, to make pages finish out of order
+    """
+    def route(request):
+        page_number = int(request['query']['page[number]'][0])
+        page_size = int(request['query']['page[size]'][0])
+        total_pages = max(-(-len(rows) // page_size), 1)
+        data = rows[(page_number - 1) * page_size:page_number * page_size]
+        delay = delay_for(page_number, total_pages) if delay_for else 0.0
+        return json_response({'data': data, 'meta': {'total-pages': total_pages}}, delay=delay)
+    return route
+
+
+def debt_rows(count):
+    return [{'record_date': f"{1800 + i}-09-30", 'debt_outstanding_amt': str(1000 + i)} for i in range(count)]
+
+
+def test_paging_parallel_in_order(stub_server):
+    rows = debt_rows(95)
+    # later pages answer FIRST, so they finish out of order
+    stub_server.routes['/debt'] = paged_route(rows, lambda page, total: 0.02 * (total - page))
+    treasury = stub_treasury()
+    start = time.perf_counter()
+    assert treasury.getAllDebtPages(stub_server.url('/debt'), page_size=10, concurrent=True) == rows
+    parallel_seconds = time.perf_counter() - start
+    assert 1 < stub_server.max_in_flight <= treasury.max_workers
+    # every page asked for exactly once
+    assert sorted(int(r['query']['page[number]'][0]) for r in stub_server.requests) == list(range(1, 11))
+
+    stub_server.requests.clear()
+    start = time.perf_counter()
+    assert treasury.getAllDebtPages(stub_server.url('/debt'), page_size=10, concurrent=False) == rows
+    assert parallel_seconds < time.perf_counter() - start
+
+
+def test_paging_single_page_and_filter(stub_server):
+    rows = debt_rows(5)
+    stub_server.routes['/debt'] = paged_route(rows)
+    result = stub_treasury().getAllDebtPages(stub_server.url('/debt'), page_size=100,
+                                             filters='record_date:gt:1801-09-30')
+    assert result == rows
+    assert len(stub_server.requests) == 1
+    assert stub_server.requests[0]['query'].get('filter') == ['record_date:gt:1801-09-30']
+
+
+def test_paging_failed_page_raises(stub_server):
+    pages = paged_route(debt_rows(40))
+
+    def route(request):
+        if request['query']['page[number]'] == ['3']:
+            return StubResponse(503, 'down')
+        return pages(request)
+    stub_server.routes['/debt'] = route
+    # a page that keeps failing raises instead of leaving a hole in the data
+    with pytest.raises(ConnectionError, match='page 3'):
+        stub_treasury(retries=1).getAllDebtPages(stub_server.url('/debt'), page_size=10)
+
+
+# --- debt backup sync ---
+DAY_SECONDS = 24 * 60 * 60
+
+
+def fiscal_rows(years):
+    return [{'record_date': f"{year}-09-30", 'record_fiscal_year': str(year),
+             'debt_outstanding_amt': str(year * 1000)} for year in years]
+
+
+def filtered_debt_route(rows):
+    """
+    debt_outstanding pages that honour the 'record_date:gt:...' filter the incremental sync sends
+    """
+    def route(request):
+        data = rows
+        for condition in request['query'].get('filter', []):
+            _, _, after = condition.split(':', 2)
+            data = [row for row in data if row['record_date'] > after]
+        return json_response({'data': data, 'meta': {'total-pages': 1}})
+    return route
+
+
+def debt_backup(tmp_path, years, age_days):
+    storage_path = str(tmp_path / 'debt_backup.json')
+    TA.Treasury.saveDebtBackup(storage_path, fiscal_rows(years))
+    old = time.time() - age_days * DAY_SECONDS
+    os.utime(storage_path, (old, old))
+    return storage_path
+
+
+@pytest.mark.parametrize('age_days', [1, 340, 351, 800])
+def test_debt_sync_no_new_rows_marks_backup_checked(stub_server, tmp_path, age_days):
+    # the dataset gets about one row a year, so most syncs find nothing new - the backup's age must not stop
+    # the next sync (a backup untouched for 350+ days used to skip the api for good)
+    stub_server.routes['/debt'] = filtered_debt_route(fiscal_rows(range(2020, 2025)))
+    storage_path = debt_backup(tmp_path, range(2020, 2025), age_days)
+
+    debt_df, data_flag = stub_treasury().getHistoricalDebtAPIData(stub_server.url('/debt'), incremental=True,
+                                                                  storage_path=storage_path)
+    assert data_flag == 'API'
+    assert len(stub_server.requests) == 1
+    assert stub_server.requests[0]['query']['filter'] == ['record_date:gt:2024-09-30']
+    assert debt_df['record_fiscal_year'].tolist() == list(range(2020, 2025))
+    # checked just now
+    assert time.time() - os.path.getmtime(storage_path) < 60
+
+
+def test_debt_sync_merges_new_rows(stub_server, tmp_path):
+    stub_server.routes['/debt'] = filtered_debt_route(fiscal_rows(range(2020, 2026)))
+    storage_path = debt_backup(tmp_path, range(2020, 2025), 351)
+    debt_df, data_flag = stub_treasury().getHistoricalDebtAPIData(stub_server.url('/debt'), incremental=True,
+                                                                  storage_path=storage_path)
+    assert data_flag == 'API'
+    assert debt_df['record_fiscal_year'].tolist() == list(range(2020, 2026))
+    assert [row['record_fiscal_year'] for row in TA.Treasury.loadDebtBackup(storage_path)] == \
+        [str(year) for year in range(2020, 2026)]
+
+
+def test_debt_sync_api_down_uses_backup(stub_server, tmp_path):
+    stub_server.routes['/debt'] = lambda request: StubResponse(503, 'down')
+    storage_path = debt_backup(tmp_path, range(2020, 2025), 10)
+    modified_time = os.path.getmtime(storage_path)
+    for incremental in (True, False):
+        debt_df, data_flag = stub_treasury(retries=0).getHistoricalDebtAPIData(
+            stub_server.url('/debt'), incremental=incremental, storage_path=storage_path)
+        assert data_flag == 'Back Up'
+        assert debt_df['record_fiscal_year'].tolist() == list(range(2020, 2025))
+    # a failed sync is not a check
+    assert os.path.getmtime(storage_path) == modified_time
+
+
+# --- Treasury.downloadIfChanged (ETag / Last-Modified) ---
+class WorkbookRoute:
+    """
+    Serves `body` with an ETag / Last-Modified and answers 304 when the request's validators still match.
+    Set status to make it fail instead
+    """
+
+    def __init__(self, body, etag, last_modified='Wed, 01 Jan 2025 00:00:00 GMT'):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.status = 200
+
+    def __call__(self, request):
+        if self.status != 200:
+            return StubResponse(self.status, 'nope')
+        headers = {'ETag': self.etag, 'Last-Modified': self.last_modified}
+        if request['headers'].get('If-None-Match') == self.etag:
+            return StubResponse(304, b'', headers)
+        return StubResponse(200, self.body, headers)
+
+
+def test_download_if_changed(stub_server, tmp_path):
+    workbook = WorkbookRoute(b'workbook v1' * 10000, '"v1"')
+    stub_server.routes['/fed.xlsx'] = workbook
+    url = stub_server.url('/fed.xlsx')
+    save_location = str(tmp_path / 'fed.xlsx')
+    validators_path = str(tmp_path / 'fed.http.json')
+    treasury = stub_treasury()
+
+    # 1. nothing on disk - plain GET, file + validators saved
+    assert treasury.downloadIfChanged(url, save_location) == 'downloaded'
+    assert 'If-None-Match' not in stub_server.requests[-1]['headers']
+    assert read_bytes(save_location) == workbook.body
+    validators = treasury.loadValidators(validators_path)
+    assert (validators['etag'], validators['last_modified']) == ('"v1"', workbook.last_modified)
+    assert time.time() - validators['last_checked'] < 60
+
+    # 2. same ETag - 304, file left alone, only the check time moves
+    validators['last_checked'] -= 400 * DAY_SECONDS
+    treasury.saveValidators(validators_path, validators)
+    modified_time = os.path.getmtime(save_location)
+    assert treasury.downloadIfChanged(url, save_location) == 'not modified'
+    headers = stub_server.requests[-1]['headers']
+    assert headers.get('If-None-Match') == '"v1"'
+    assert headers.get('If-Modified-Since') == workbook.last_modified
+    assert read_bytes(save_location) == workbook.body
+    assert os.path.getmtime(save_location) == modified_time
+    assert time.time() - treasury.loadValidators(validators_path)['last_checked'] < 60
+
+    # 3. the workbook changed - new file, new validators
+    workbook.body, workbook.etag = b'workbook v2' * 10000, '"v2"'
+    assert treasury.downloadIfChanged(url, save_location) == 'downloaded'
+    assert read_bytes(save_location) == workbook.body
+    assert treasury.loadValidators(validators_path)['etag'] == '"v2"'
+
+    # 4. file deleted but validators still there - must not ask 'did it change'
+    os.remove(save_location)
+    assert treasury.downloadIfChanged(url, save_location) == 'downloaded'
+    assert 'If-None-Match' not in stub_server.requests[-1]['headers']
+
+
+def test_download_failure_keeps_old_file(stub_server, tmp_path):
+    workbook = WorkbookRoute(b'good workbook', '"v1"')
+    stub_server.routes['/fed.xlsx'] = workbook
+    url = stub_server.url('/fed.xlsx')
+    save_location = str(tmp_path / 'fed.xlsx')
+    treasury = stub_treasury()
+    assert treasury.downloadIfChanged(url, save_location) == 'downloaded'
+
+    workbook.status = 500
+    assert treasury.downloadIfChanged(url, save_location) == 'failed'
+    assert read_bytes(save_location) == b'good workbook'
+
+    # server gone altogether
+    stub_server.stop()
+    assert treasury.downloadIfChanged(url, save_location, timeout=2) == 'failed'
+    assert read_bytes(save_location) == b'good workbook'
+    assert not os.path.exists(save_location + '.tmp')
+
+
+@pytest.mark.parametrize('workbook_age_days', [1, 351])
+def test_tax_policy_rechecked_once_a_day(stub_server, tmp_path, workbook_age_days):
+    # the gate goes by the last check in the .http.json, not the workbook's mtime - an unchanged workbook
+    # (304 after 304) must keep getting checked no matter how old the file is
+    workbook_bytes = read_bytes(TAX_POLICY_SOURCE)
+    stub_server.routes['/fed.xlsx'] = WorkbookRoute(workbook_bytes, '"v1"')
+    url = stub_server.url('/fed.xlsx')
+    save_location = str(tmp_path / 'fed.xlsx')
+    validators_path = str(tmp_path / 'fed.http.json')
+    treasury = stub_treasury()
+
+    assert not treasury.getTaxPolicyDownload(save_location, url).empty
+    old = time.time() - workbook_age_days * DAY_SECONDS
+    os.utime(save_location, (old, old))
+
+    # checked less than a day ago - no request
+    assert not treasury.getTaxPolicyDownload(save_location, url).empty
+    assert len(stub_server.requests) == 1
+
+    # last check a day ago - asks again, 304, new check time
+    validators = treasury.loadValidators(validators_path)
+    validators['last_checked'] -= TA.TAX_POLICY_RECHECK_SECONDS + 1
+    treasury.saveValidators(validators_path, validators)
+    assert not treasury.getTaxPolicyDownload(save_location, url).empty
+    assert len(stub_server.requests) == 2
+    assert stub_server.requests[-1]['headers'].get('If-None-Match') == '"v1"'
+    assert time.time() - treasury.loadValidators(validators_path)['last_checked'] < 60
+    assert os.path.getmtime(save_location) == pytest.approx(old)